@@ -0,0 +1,308 @@
+"""
+This file records what the game shows as an asciicast, and plays it back
+
+A recording is an asciicast v2 file: a header line (JSON) with the size of
+the terminal, followed by one [time, "o", output] line per frame and a
+[time, "r", "COLSxROWS"] line whenever the terminal is resized. It can also
+be played with asciinema. Files ending in .gz or .xz are compressed.
+
+The game only appends frames to a list, every config.CAST_BATCH frames
+the list is handed to a thread which formats, compresses and writes them.
+At most config.CAST_QUEUE lists wait for the thread, so a long game takes
+no more memory than a short one.
+
+Run this file to play a recording, seeking with the keyboard:
+
+    python3 asciicast.py game.cast.gz --speed 2 --start 30
+"""
+
+import os
+import gzip
+import lzma
+import json
+import time
+import queue
+import argparse
+import threading
+import colorama as col
+
+from screen import write_frame
+import config
+import util
+
+VERSION = 2
+
+# seconds skipped by a seek
+SEEK_STEP = 10.
+
+
+def open_cast(path, mode):
+    """
+    Opens a recording as text, compressed if the name says so
+
+    Args:
+        path (str) : Path of the recording
+        mode (str) : "r" or "w"
+    """
+    # fast settings, recordings are compressed while the game runs
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    if path.endswith(".xz"):
+        return lzma.open(path, mode + "t", encoding="utf-8", preset=1 if mode == "w" else None)
+
+    return open(path, mode, encoding="utf-8")
+
+
+class CastWriter:
+    """
+    Writes frames to an asciicast file on a background thread
+    """
+
+    def __init__(self, path, width, height):
+        """
+        Constructor for CastWriter
+
+        Args:
+            path (str)         : Where the recording is written
+            width, height (int) : Size of the terminal
+        """
+        self.__file = open_cast(path, "w")
+        self.__file.write(json.dumps({
+            "version": VERSION,
+            "width": width,
+            "height": height,
+            "timestamp": int(time.time()),
+            "env": {"TERM": os.environ.get("TERM", "")}
+        }) + "\n")
+
+        self.__start = time.perf_counter()
+
+        # (time, type, data) of the events not handed over yet
+        self.__events = []
+        self.__batches = queue.Queue(maxsize=config.CAST_QUEUE)
+
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def __run(self):
+        """
+        Writes the batches of events till close() sends None
+        """
+        while True:
+            events = self.__batches.get()
+            if events is None:
+                break
+
+            self.__file.write("".join(f"[{_t:.6f}, \"{kind}\", {json.dumps(data)}]\n"
+                                      for _t, kind, data in events))
+
+        self.__file.close()
+
+    def __add(self, kind, data):
+        """
+        Adds an event, handing the batch over once it is full
+        """
+        self.__events.append((time.perf_counter() - self.__start, kind, data))
+
+        if len(self.__events) >= config.CAST_BATCH:
+            self.__batches.put(self.__events)
+            self.__events = []
+
+    def write(self, text):
+        """
+        Records output to the terminal
+        """
+        self.__add("o", text)
+
+    def resize(self, width, height):
+        """
+        Records the terminal changing size
+        """
+        self.__add("r", f"{width}x{height}")
+
+    def close(self):
+        """
+        Writes whatever is left and closes the file
+        """
+        if self.__thread is None:
+            return
+
+        self.__batches.put(self.__events)
+        self.__batches.put(None)
+        self.__thread.join()
+
+        self.__events = []
+        self.__thread = None
+
+
+def read_cast(path):
+    """
+    Reads a recording one event at a time
+
+    Args:
+        path (str) : Path of the recording
+
+    Returns:
+        (dict, generator) : The header, and the (time, type, data) events
+    """
+    _f = open_cast(path, "r")
+    header = json.loads(_f.readline())
+
+    if header.get("version") != VERSION:
+        _f.close()
+        raise ValueError(f"{path}: unsupported asciicast version {header.get('version')}")
+
+    def events():
+        with _f:
+            for line in _f:
+                if line.strip():
+                    yield tuple(json.loads(line))
+
+    return header, events()
+
+
+class CastPlayer:
+    """
+    Plays a recording on the terminal
+
+    Keys: `D` skips SEEK_STEP seconds ahead, `A` goes as far back, <Space>
+    pauses and `Q` quits. Frames only hold what changed, so seeking writes
+    out every frame up to the new position without waiting, a batch at a
+    time, and going back starts over from the beginning of the file.
+    """
+
+    def __init__(self, path, speed=1.):
+        """
+        Constructor for CastPlayer
+
+        Args:
+            path (str)    : Path of the recording
+            speed (float) : How many times faster than real time to play
+        """
+        self.__path = path
+        self.__speed = speed
+
+        # position in the recording, in seconds
+        self.__position = 0.
+
+    def play(self, start=0., kb_inp=None):
+        """
+        Plays the recording from start seconds in, until it ends or Q
+
+        Args:
+            start (float) : Where to start, in seconds
+            kb_inp        : Where keys come from, the keyboard (KBHit) by default
+        """
+        kb_inp = kb_inp or util.KBHit()
+        seek = start
+
+        while seek is not None:
+            seek = self.__play_from(seek, kb_inp)
+
+    def __play_from(self, seek, kb_inp):
+        """
+        Plays from the start of the file, catching up to seek at once
+
+        Returns:
+            float : Where to go back to, None once done
+        """
+        _, events = read_cast(self.__path)
+
+        # the clock of the recording is ahead of time.perf_counter() by this
+        origin = time.perf_counter() - seek / self.__speed
+        catching_up = []
+
+        for _t, kind, data in events:
+            if kind != "o":
+                continue
+
+            if _t < seek:
+                # written without waiting, along with the rest of the batch
+                catching_up.append(data)
+                self.__position = _t
+
+                if len(catching_up) >= config.CAST_BATCH:
+                    write_frame("".join(catching_up))
+                    catching_up = []
+                continue
+
+            if catching_up:
+                write_frame("".join(catching_up))
+                catching_up = []
+
+            deadline = origin + _t / self.__speed
+
+            while time.perf_counter() < deadline:
+                # short waits, so that keys are handled right away
+                kb_inp.wait_until(min(deadline, time.perf_counter() + 0.05))
+                now = (time.perf_counter() - origin) * self.__speed
+
+                keys = kb_inp.keys()
+                if "q" in keys:
+                    return None
+                if "a" in keys:
+                    events.close()
+                    return max(0., now - SEEK_STEP)
+                if "d" in keys:
+                    seek = now + SEEK_STEP
+                    origin -= SEEK_STEP / self.__speed
+                    deadline = origin + _t / self.__speed
+                if " " in keys:
+                    paused = self.__pause(kb_inp)
+                    if paused is None:
+                        return None
+
+                    origin += paused
+                    deadline = origin + _t / self.__speed
+
+            self.__position = _t
+            write_frame(data)
+
+        if catching_up:
+            write_frame("".join(catching_up))
+
+        return None
+
+    @staticmethod
+    def __pause(kb_inp):
+        """
+        Waits for <Space> or Q
+
+        Returns:
+            float : How long it waited, None for Q
+        """
+        beg = time.perf_counter()
+
+        while True:
+            kb_inp.wait_until(time.perf_counter() + 0.05)
+            keys = kb_inp.keys()
+
+            if "q" in keys:
+                return None
+            if " " in keys:
+                return time.perf_counter() - beg
+
+    def get_position(self):
+        """
+        Returns the time in the recording of the last frame shown
+        """
+        return self.__position
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play a game recorded with --cast")
+    parser.add_argument("path", help="the recording, .cast, .cast.gz or .cast.xz")
+    parser.add_argument("--speed", type=float, default=1.,
+                        help="how many times faster than real time to play")
+    parser.add_argument("--start", type=float, default=0., help="seconds to skip")
+    args = parser.parse_args()
+
+    col.init()
+    print("\033[?25l\033[2J", end="")
+
+    try:
+        CastPlayer(args.path, args.speed).play(args.start)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(col.Style.RESET_ALL + "\033[?25h")
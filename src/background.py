@@ -14,6 +14,8 @@ class Background(GameObject):
     This is the base class for all decorations
     """
 
+    __slots__ = ()
+
     def __init__(self, rep, position, velocity):
         """
         Constructor for background
@@ -26,15 +28,7 @@ class Background(GameObject):
         """
         Updates the background object
         """
-        vel = self.get_velocity()
-        self.add_velocity(np.array([np.sign(vel[0]) * config.BOOST_ACTIVE, 0.]))
-
-        self.add_position(self.get_velocity())
-
-        pos = self.get_position()
-        _, _w = self.get_shape()
-
-        return self.get_active() and pos[0] + _w >= 0
+        return self.drift()
 
 
 class Falcon(Background):
@@ -42,6 +36,8 @@ class Falcon(Background):
     This will be the base class for Millenium Falcon
     """
 
+    __slots__ = ()
+
     def __init__(self):
         """
         Constructor for falcon
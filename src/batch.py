@@ -0,0 +1,213 @@
+"""
+This file plays many headless games in parallel, for balancing the game
+
+Each game gets its own seed and config overrides, and the games are
+spread over a process pool. Every finished game is streamed back as one
+record, and the records are summarized per set of overrides, e.g.:
+    python3 batch.py --runs 500 --set BOSS_MIN_SCORE=2000,4000 --set DRAG_CONST=0.1
+"""
+
+import os
+import sys
+import json
+import argparse
+import itertools
+import multiprocessing
+import numpy as np
+
+import headless
+import config
+
+# keys the random player presses, the weights favour flying
+RANDOM_KEYS = "wwwwaddee"
+
+
+def random_script(seed, ticks, rate=0.3):
+    """
+    Makes up the keys of a player who presses random keys
+
+    Args:
+        seed (int)   : Seed for the keys
+        ticks (int)  : Number of ticks to make keys for
+        rate (float) : Chance of pressing a key on a tick
+
+    Returns:
+        dict : tick -> keys
+    """
+    rng = np.random.default_rng(seed)
+
+    pressed = np.flatnonzero(rng.uniform(size=ticks) < rate) + 1
+    keys = rng.choice(list(RANDOM_KEYS), size=len(pressed))
+
+    return dict(zip(pressed.tolist(), keys.tolist()))
+
+
+def run_one(job):
+    """
+    Plays one game, this is what the workers run
+
+    Args:
+        job (dict) : seed, overrides, ticks, size, script (None for a
+                     random player) and rate
+
+    Returns:
+        dict : The job's seed and overrides + the game's stats
+    """
+    # the size is overridden along with the rest, so that it only lasts
+    # for this game too and a swept WIDTH, HEIGHT, ... still wins over it
+    overrides = config.layout(*job["size"]) if job["size"] is not None else {}
+    overrides.update(job["overrides"])
+
+    # overrides only last for this game, the next job starts from scratch,
+    # and they may change how long a game lasts
+    with config.override(**overrides):
+        ticks = job["ticks"] or int(config.TOTAL_TIME / config.DELAY) + 1
+        script = job["script"]
+        if script is None:
+            script = random_script(job["seed"], ticks, job["rate"])
+
+        stats = headless.run(script, ticks, seed=job["seed"])
+
+    return {"overrides": job["overrides"], **stats}
+
+
+def make_jobs(runs, sweep, ticks=None, size=None, script=None, rate=0.3, seed=0):
+    """
+    Makes a job for every run of every combination of overrides
+
+    Args:
+        runs (int)    : Games per combination
+        sweep (dict)  : NAME -> list of values to try
+        ticks (int)   : Ticks per game, None to play till the game is over
+        size (tuple)  : (rows, columns) of the terminal
+        script (dict) : Keys for every game, None for a random player
+        rate (float)  : Chance of the random player pressing a key
+        seed (int)    : Seed of the first game, the others count up from it.
+                        Every combination plays the same seeds, so they
+                        can be compared game by game
+
+    Returns:
+        generator of dict : The jobs
+    """
+    names = list(sweep)
+
+    for values in itertools.product(*(sweep[name] for name in names)):
+        overrides = dict(zip(names, values))
+
+        for run in range(runs):
+            yield {"seed": seed + run, "overrides": overrides, "ticks": ticks,
+                   "size": size, "script": script, "rate": rate}
+
+
+def run_batch(jobs, processes=None, chunksize=4):
+    """
+    Plays all the jobs on a process pool
+
+    Args:
+        jobs (iterable)  : Jobs, see make_jobs
+        processes (int)  : Number of workers, one per core by default
+        chunksize (int)  : Jobs handed to a worker at a time
+
+    Returns:
+        generator of dict : A record per game, in the order they finish
+    """
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap_unordered(run_one, jobs, chunksize)
+
+
+class Summary:
+    """
+    Running statistics over the records of one set of overrides
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.scores = []
+        self.times = []
+        self.boss = 0
+        self.won = 0
+        self.wall_time = 0.
+
+    def add(self, record):
+        """
+        Adds a game's record
+        """
+        self.runs += 1
+        self.scores.append(record["score"])
+        self.times.append(record["time"])
+        self.boss += record["boss_mode"]
+        self.won += record["won"]
+        self.wall_time += record["wall_time"]
+
+    def row(self):
+        """
+        Returns the summary as a dict
+        """
+        return {
+            "runs": self.runs,
+            "score_mean": float(np.mean(self.scores)),
+            "score_std": float(np.std(self.scores)),
+            "time_mean": float(np.mean(self.times)),
+            "boss_reached": self.boss / self.runs,
+            "won": self.won / self.runs,
+        }
+
+
+def parse_sweep(settings):
+    """
+    Parses NAME=v1,v2,.. settings into NAME -> [v1, v2, ..]
+    """
+    sweep = {}
+
+    for setting in settings:
+        name, values = setting.split("=", 1)
+        sweep[name] = [json.loads(value) for value in values.split(",")]
+
+    return sweep
+
+
+def main():
+    """
+    Runs a batch from the command line
+    """
+    parser = argparse.ArgumentParser(description="Play many headless games")
+    parser.add_argument("--runs", type=int, default=100, help="games per combination")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2",
+                        help="config values to sweep over")
+    parser.add_argument("--ticks", type=int, help="ticks per game")
+    parser.add_argument("--size", default="40x130", help="terminal size, ROWSxCOLUMNS")
+    parser.add_argument("--rate", type=float, default=0.3,
+                        help="chance of the random player pressing a key")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--out", help="write every record to this file (JSON lines)")
+    args = parser.parse_args()
+
+    sweep = parse_sweep(args.set)
+    size = tuple(int(x) for x in args.size.split("x"))
+
+    jobs = make_jobs(args.runs, sweep, args.ticks, size, None, args.rate, args.seed)
+    summaries = {}
+
+    out = open(args.out, "w") if args.out else None
+
+    for done, record in enumerate(run_batch(jobs, args.processes), 1):
+        key = json.dumps(record["overrides"], sort_keys=True)
+        summaries.setdefault(key, Summary()).add(record)
+
+        if out:
+            out.write(json.dumps(record) + "\n")
+
+        print(f"\r{done} games", end="", file=sys.stderr)
+
+    print(file=sys.stderr)
+
+    if out:
+        out.close()
+
+    for key, summary in summaries.items():
+        print(key, json.dumps(summary.row()))
+
+
+if __name__ == "__main__":
+    main()
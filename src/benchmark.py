@@ -0,0 +1,515 @@
+"""
+This file contains benchmarks for the hot parts of the game
+
+Run it from a terminal:
+    python3 benchmark.py render
+    python3 benchmark.py collisions
+    python3 benchmark.py objects
+    python3 benchmark.py suite --out results.json
+    python3 benchmark.py compare baseline.json results.json
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import platform
+import tracemalloc
+import argparse
+import contextlib
+import numpy as np
+import colorama as col
+
+from game import Game
+from objects import GameObject
+from screen import Screen
+from objects import Ground
+from obstacles import FireBeam, Magnet
+from coins import Coin
+from bullets import MandalorianBullet
+from player import DragonBoss
+import collisions
+import config
+import palette
+import util
+
+# terminal sizes (columns, rows) to sweep over
+SIZES = [(80, 24), (120, 40), (200, 60), (300, 100)]
+
+
+def legacy_render(screen):
+    """
+    The original per cell serializer of Screen.show, kept for comparison
+
+    Args:
+        screen (Screen) : The screen to serialize
+
+    Returns:
+        str : The whole frame
+    """
+    out = ""
+
+    for i in range(screen.height):
+        for j in range(screen.width):
+            out += "".join(palette.get(screen.color[i][j])) + screen.display[i][j]
+        out += "\n"
+
+    return out + col.Style.RESET_ALL
+
+
+def make_scene(count, seed=0):
+    """
+    Creates a few fire beams scattered over the screen
+
+    Args:
+        count (int) : Number of beams
+        seed (int)  : Seed for placing them
+
+    Returns:
+        list : The objects in the scene
+    """
+    rng = np.random.default_rng(seed)
+
+    return [Ground()] + [FireBeam(np.array([rng.integers(0, config.WIDTH - 9),
+                                            rng.integers(0, config.MAX_HEIGHT - 5)],
+                                           dtype="float64"), k % config.FIREBEAM_MAX)
+                         for k in range(count)]
+
+
+def timeit(func, repeat):
+    """
+    Returns the average time (in ms) taken by func over repeat calls
+    """
+    _t = time.perf_counter()
+    for _ in range(repeat):
+        func()
+
+    return 1000 * (time.perf_counter() - _t) / repeat
+
+
+def bench_render(repeat=20):
+    """
+    Compares the legacy serializer with the full and delta output of
+    Screen.render over all the sizes in SIZES
+    """
+    print(f"{'size':>9} {'legacy ms':>10} {'full ms':>9} {'delta ms':>9} "
+          f"{'legacy B':>9} {'delta B':>8}")
+
+    for columns, rows in SIZES:
+        config.set_screen_size(rows, columns)
+
+        screen = Screen()
+        scene = make_scene(columns // 10)
+
+        def draw():
+            screen.clear()
+            for obj in scene:
+                if not obj.update():
+                    # wrap around instead of respawning
+                    obj.set_position(np.array([config.WIDTH - 9., obj.get_position()[1]]))
+                screen.draw(obj)
+
+        def full():
+            screen.invalidate()
+            screen.render()
+
+        draw()
+        legacy = timeit(lambda: legacy_render(screen), max(1, repeat // 4))
+        legacy_bytes = len(legacy_render(screen))
+        full_ms = timeit(full, repeat)
+
+        delta_ms = delta_bytes = 0
+        for _ in range(repeat):
+            draw()
+            _t = time.perf_counter()
+            delta_bytes += len(screen.render())
+            delta_ms += 1000 * (time.perf_counter() - _t)
+
+        print(f"{columns:>4}x{rows:<4} {legacy:>10.2f} {full_ms:>9.2f} "
+              f"{delta_ms / repeat:>9.2f} {legacy_bytes:>9} {delta_bytes // repeat:>8}")
+
+
+def legacy_collisions(boxes_a, boxes_b):
+    """
+    The original nested loop of Game.detect_collisions, kept for comparison
+    """
+    hits = []
+
+    for i, (x_a, y_a, h_a, w_a) in enumerate(boxes_a):
+        for j, (x_b, y_b, h_b, w_b) in enumerate(boxes_b):
+            if max(x_a + w_a, x_b + w_b) - min(x_a, x_b) >= w_a + w_b \
+                    or max(y_a + h_a, y_b + h_b) - min(y_a, y_b) >= h_a + h_b:
+                continue
+            hits.append((i, j))
+
+    return hits
+
+
+def sweep_collisions(boxes_a, boxes_b):
+    """
+    Tests every box in boxes_a against all of boxes_b at once, which is
+    what Game.detect_collisions does when there is no broad phase
+    """
+    return [np.flatnonzero(util.overlaps(box, boxes_b)) for box in boxes_a]
+
+
+def bench_collisions(repeat=20):
+    """
+    Compares the nested loop, the per hitter sweep and the grid broad
+    phase with n bullets against n coins on a 200x60 screen
+    """
+    config.set_screen_size(60, 200)
+    rng = np.random.default_rng(0)
+
+    print(f"{'n':>6} {'loop ms':>9} {'sweep ms':>9} {'grid ms':>9} {'hits':>6}")
+
+    for count in (50, 100, 200, 400, 800, 1600):
+        bullets = np.column_stack((rng.integers(0, config.WIDTH, count),
+                                   rng.integers(0, config.MAX_HEIGHT, count),
+                                   np.ones(count), np.full(count, 8))).astype("float64")
+        coins = np.column_stack((rng.integers(0, config.WIDTH, count),
+                                 rng.integers(0, config.MAX_HEIGHT, count),
+                                 np.ones(count), np.ones(count))).astype("float64")
+
+        loop = "-"
+        if count <= 200:
+            loop = f"{timeit(lambda: legacy_collisions(bullets, coins), 1):.2f}"
+
+        sweep = timeit(lambda: sweep_collisions(bullets, coins), repeat)
+        grid = timeit(lambda: collisions.colliding_pairs(bullets, coins), repeat)
+        hits = len(collisions.colliding_pairs(bullets, coins)[0])
+
+        print(f"{count:>6} {loop:>9} {sweep:>9.2f} {grid:>9.2f} {hits:>6}")
+
+
+class LegacyGameObject:
+    """
+    GameObject as it was, with its physics on 2 element NumPy arrays
+    """
+
+    def __init__(self, rep, position, velocity, accel, gravity):
+        self.__rep = rep
+        self.__position = position
+        self.__velocity = velocity
+        self.__accel = accel
+        self.__gravity = gravity
+        self.__height, self.__width = self.__rep.shape
+        self.__active = True
+
+    def update(self):
+        """
+        GameObject.update as it was
+        """
+        is_on_ground = self.__position[1] + self.__height >= \
+                        config.MAX_HEIGHT
+
+        if np.isinf(self.__velocity[0]):
+            self.__velocity[0] = 0
+
+        self.__accel[0] = ((-1) ** int(self.__velocity[0] >= 0)) *\
+                config.DRAG_CONST * (self.__velocity[0] ** 2)
+        self.__accel[1] = self.__gravity * int(not is_on_ground)
+
+        if self.__class__.__name__ != "Mandalorian":
+            self.__velocity[0] += np.sign(self.__velocity[0]) * config.BOOST_ACTIVE
+
+        self.__velocity += self.__accel
+
+        if self.__position[1] == 0:
+            self.__velocity[1] = max(0, self.__velocity[1])
+
+        if is_on_ground:
+            self.__velocity[1] = min(0, self.__velocity[1])
+
+        np.clip(self.__velocity, -5, 5)
+
+        tmp_pos = self.__position + self.__velocity
+
+        self.__position[0] = int(np.round(np.clip(tmp_pos[0], 0, config.WIDTH - self.__width)))
+        self.__position[1] = int(np.round(np.clip(tmp_pos[1], 0, config.MAX_HEIGHT - self.__height)))
+
+        return self.__active and self.__position[0] + self.__width >= 0
+
+    def drift(self):
+        """
+        Obstacle.update as it was
+        """
+        self.__velocity += np.array([np.sign(self.__velocity[0]) * config.BOOST_ACTIVE, 0.])
+        self.__position += self.__velocity
+
+        return self.__active and self.__position[0] + self.__width >= 0
+
+
+def bench_objects(repeat=20, count=1000):
+    """
+    Compares GameObject's physics on floats with the old one on NumPy
+    arrays, per object update and memory per object
+    """
+    config.set_screen_size(40, 130)
+    rng = np.random.default_rng(0)
+    rep = np.full((3, 3), "#")
+
+    def make(cls):
+        return [cls(rep, rng.uniform(0, config.MAX_HEIGHT, 2), rng.uniform(-2, 2, 2),
+                    np.zeros(2), 0.45) for _ in range(count)]
+
+    def size(cls):
+        tracemalloc.start()
+        objects = make(cls)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return used / len(objects)
+
+    print(f"{'update':>8} {'legacy us':>10} {'new us':>8} {'speedup':>8}")
+
+    for method in ("update", "drift"):
+        times = []
+        for cls in (LegacyGameObject, GameObject):
+            objects = make(cls)
+            times.append(1000 * timeit(lambda: [getattr(obj, method)() for obj in objects],
+                                       repeat) / count)
+
+        print(f"{method:>8} {times[0]:>10.2f} {times[1]:>8.2f} {times[0] / times[1]:>7.1f}x")
+
+    print(f"bytes per object: legacy {size(LegacyGameObject):.0f}, new {size(GameObject):.0f}")
+
+
+def scene_coins(game, count, rng):
+    """
+    Scatters count coins over the screen
+    """
+    for _ in range(count):
+        game.add_object("coins", Coin(np.array([rng.integers(0, config.WIDTH),
+                                               rng.integers(0, config.MAX_HEIGHT)], dtype="float64")))
+
+
+def scene_beams(game, count, rng):
+    """
+    Scatters count fire beams over the screen
+    """
+    for k in range(count):
+        game.add_object("beams", FireBeam(np.array([rng.integers(0, config.WIDTH - 9),
+                                                    rng.integers(0, config.MAX_HEIGHT - 5)],
+                                                   dtype="float64"), k % config.FIREBEAM_MAX))
+
+
+def scene_bullets(game, count, rng):
+    """
+    Scatters count of the Mandalorian's bullets over the screen
+    """
+    for _ in range(count):
+        game.add_object("player_bullet", MandalorianBullet(
+            np.array([rng.integers(0, config.WIDTH - 20),
+                      rng.integers(0, config.MAX_HEIGHT)], dtype="float64")))
+
+
+def scene_magnets(game, count, rng):
+    """
+    Scatters count magnets over the screen, pulling on the player
+    """
+    for _ in range(count):
+        game.add_object("magnets", Magnet(np.array([rng.integers(0, config.WIDTH - 5),
+                                                    rng.choice([0, config.MAX_HEIGHT - 3])],
+                                                   dtype="float64"), game))
+
+
+def scene_boss(game, count, rng):
+    """
+    The boss fight, with count coins left over
+    """
+    game.add_object("boss", DragonBoss(game))
+    scene_coins(game, count, rng)
+
+
+def scene_dragon(game, count, rng):
+    """
+    The dragon is out, with count coins to eat
+    """
+    game.activate_dragon()
+    scene_coins(game, count, rng)
+
+
+SCENES = {
+    "empty": lambda game, count, rng: None,
+    "coins": scene_coins,
+    "beams": scene_beams,
+    "bullets": scene_bullets,
+    "magnets": scene_magnets,
+    "boss": scene_boss,
+    "dragon": scene_dragon,
+}
+
+PHASES = ("update", "collisions", "clear", "draw", "show", "frame")
+
+
+def bench_scene(columns, rows, scene, count, ticks):
+    """
+    Times every phase of the frame pipeline on a synthetic scene
+
+    Nothing is spawned while measuring and the output of Screen.show goes
+    to os.devnull, so only the game's own work is measured.
+
+    Args:
+        columns, rows (int) : Size of the terminal
+        scene (str)         : Name of the scene in SCENES
+        count (int)         : Number of objects in the scene
+        ticks (int)         : Ticks to measure over
+
+    Returns:
+        dict : phase -> median time in ms
+    """
+    config.set_screen_size(rows, columns)
+    times = {phase: [] for phase in PHASES}
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+            config.override(FIREBEAM_PROB=0, MAGNET_PROB=0, COINS_PROB=0,
+                            TOTAL_TIME=float("inf"), BOSS_MIN_SCORE=float("inf")):
+        game = Game(seed=0)
+        SCENES[scene](game, count, np.random.default_rng(0))
+
+        screen = game.get_screen()
+        groups = game.get_objects()
+        kb_inp = util.ScriptedInput({}, game.get_tick)
+
+        def update():
+            # like Game.tick, the magnets' pull is applied before the rest move
+            groups["magnets"].update()
+            game.apply_fields()
+
+            for name, group in groups.items():
+                if name != "magnets":
+                    group.update()
+
+        def phases():
+            yield "update", update
+            yield "collisions", game.detect_collisions
+            yield "clear", screen.clear
+            yield "draw", lambda: [group.draw(screen, 0) for group in groups.values()]
+            yield "show", screen.show
+            yield "frame", lambda: (game.tick(kb_inp), game.render())
+
+        for _ in range(ticks):
+            for phase, func in phases():
+                _t = time.perf_counter()
+                func()
+                times[phase].append(1000 * (time.perf_counter() - _t))
+
+        del game, groups, screen, kb_inp
+        gc.collect()
+
+    return {phase: float(np.median(samples)) for phase, samples in times.items()}
+
+
+def bench_suite(repeat=20, count=200, out=None):
+    """
+    Runs every scene at every size in SIZES, optionally saving the
+    results as JSON for `compare`
+    """
+    results = []
+
+    print(f"{'size':>9} {'scene':>8} " + " ".join(f"{phase:>10}" for phase in PHASES))
+
+    for columns, rows in SIZES:
+        for scene in SCENES:
+            times = bench_scene(columns, rows, scene, count, repeat)
+            results.append({"size": f"{columns}x{rows}", "scene": scene, "count": count,
+                            "ms": times})
+
+            print(f"{columns:>4}x{rows:<4} {scene:>8} " +
+                  " ".join(f"{times[phase]:>10.3f}" for phase in PHASES), flush=True)
+
+    if out:
+        with open(out, "w") as _f:
+            json.dump({
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "results": results
+            }, _f, indent=1)
+
+
+def compare(baseline, current, threshold=0.15, floor=0.02):
+    """
+    Compares two results files written by `suite`
+
+    Args:
+        baseline (str)    : Path of the reference results
+        current (str)     : Path of the new results
+        threshold (float) : Relative slowdown which counts as a regression
+        floor (float)     : Differences below this many ms are noise
+
+    Returns:
+        int : Number of regressions
+    """
+    def load(path):
+        with open(path) as _f:
+            return {(r["size"], r["scene"], r["count"]): r["ms"] for r in json.load(_f)["results"]}
+
+    old, new = load(baseline), load(current)
+    regressions = 0
+
+    print(f"{'size':>9} {'scene':>8} {'phase':>10} {'base ms':>9} {'new ms':>9} {'ratio':>6}")
+
+    for key in sorted(old.keys() & new.keys()):
+        for phase in PHASES:
+            if phase not in old[key] or phase not in new[key]:
+                continue
+
+            before, after = old[key][phase], new[key][phase]
+            ratio = after / before if before else float("inf")
+            slower = ratio > 1 + threshold and after - before > floor
+            regressions += slower
+
+            if slower or ratio < 1 - threshold:
+                print(f"{key[0]:>9} {key[1]:>8} {phase:>10} {before:>9.3f} {after:>9.3f} "
+                      f"{ratio:>6.2f}{'  REGRESSION' if slower else ''}")
+
+    print(f"{regressions} regressions")
+
+    return regressions
+
+
+BENCHMARKS = {
+    "render": bench_render,
+    "collisions": bench_collisions,
+    "objects": bench_objects,
+}
+
+
+def main():
+    """
+    Runs the benchmarks from the command line
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks for the game")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name in BENCHMARKS:
+        sub = commands.add_parser(name, help=BENCHMARKS[name].__doc__.strip().split("\n")[0])
+        sub.add_argument("--repeat", type=int, default=20, help="runs per measurement")
+
+    sub = commands.add_parser("suite", help="time every phase over scenes and sizes")
+    sub.add_argument("--repeat", type=int, default=20, help="ticks per measurement")
+    sub.add_argument("--count", type=int, default=200, help="objects per scene")
+    sub.add_argument("--out", help="save the results to this JSON file")
+
+    sub = commands.add_parser("compare", help="flag regressions against a baseline")
+    sub.add_argument("baseline")
+    sub.add_argument("current")
+    sub.add_argument("--threshold", type=float, default=0.15,
+                     help="relative slowdown which counts as a regression")
+
+    args = parser.parse_args()
+
+    if args.command == "suite":
+        bench_suite(args.repeat, args.count, args.out)
+    elif args.command == "compare":
+        sys.exit(1 if compare(args.baseline, args.current, args.threshold) else 0)
+    else:
+        BENCHMARKS[args.command](args.repeat)
+
+
+if __name__ == "__main__":
+    main()
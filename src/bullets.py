@@ -3,18 +3,18 @@ This is the file for storing classes for bullets
 """
 
 import numpy as np
-import colorama as col
 
 from objects import GameObject
 import config
-import graphics
-import util
+import sprites
 
 class Bullet(GameObject):
     """
     Base class for all bullets
     """
 
+    __slots__ = ()
+
     def __init__(self, rep, position, velocity, color):
         """
         Constructor for Bullet
@@ -28,21 +28,13 @@ class Bullet(GameObject):
         Returns:
             bool : draw this bullet in the next frame?
         """
-        vel = self.get_velocity()
-        self.add_velocity(np.array([np.sign(vel[0]) * config.BOOST_ACTIVE, 0]))
-
-        self.add_position(self.get_velocity())
+        active = self.drift()
 
-        pos = self.get_position()
         _h, _w = self.get_shape()
 
-        self.set_position([pos[0], min(config.MAX_HEIGHT - _h, pos[1])])
+        self.set_position([self.get_x(), min(config.MAX_HEIGHT - _h, self.get_y())])
 
-        pos = self.get_position()
-
-        return self.get_active() and \
-            pos[0] + _w >= 0 and \
-            pos[0] + _w <= config.WIDTH
+        return active and self.get_x() + _w <= config.WIDTH
 
 
 class MandalorianBullet(Bullet):
@@ -50,12 +42,14 @@ class MandalorianBullet(Bullet):
     Class for bullets shot by Mandalorian
     """
 
+    __slots__ = ()
+
+    VELOCITY = np.array([2., 0.])
+
     def __init__(self, position):
-        velocity = np.array([2., 0.])
-        rep = util.str_to_array(graphics.MANDALORIAN_BULLET)
-        color = util.tup_to_array(rep.shape, (col.Back.WHITE, col.Fore.BLACK))
+        rep, color = sprites.get("mandalorian_bullet")
 
-        super().__init__(rep, position, velocity, color)
+        super().__init__(rep, position, MandalorianBullet.VELOCITY.copy(), color)
 
 
 class DragonBossBullet(Bullet):
@@ -63,38 +57,25 @@ class DragonBossBullet(Bullet):
     Class for bullets shot by DragonBoss
     """
 
+    __slots__ = ("player",)
+
+    VELOCITY = np.array([-2., 0.])
+
     def __init__(self, position, player):
-        velocity = np.array([-2., 0.])
-        rep = util.str_to_array(graphics.BOSS_BULLET)
-        color = util.tup_to_array(rep.shape, (col.Back.RED, col.Fore.YELLOW))
+        rep, color = sprites.get("boss_bullet")
 
         self.player = player
 
-        super().__init__(rep, position, velocity, color)
+        super().__init__(rep, position, DragonBossBullet.VELOCITY.copy(), color)
 
     def update(self):
         """
-        Manages the bullet updates which are supposed to follow Mandalorian
+        Moves the bullet, now and then homing in on the Mandalorian with a
+        normal from the game's spawn scheduler, like the boss_bullet store
         """
-        vel = self.get_velocity()
-
-        self.add_velocity([np.sign(vel[0]) * config.BOOST_ACTIVE, 0])
+        y_diff = self.player.get_y() - self.get_y()
+        homing = self.player.game.get_scheduler().normal() > 0.99
 
-        y_diff = self.player.get_position()[1] - self.get_position()[1]
-
-        vel = self.get_velocity()
-        self.set_velocity([vel[0], int(np.random.normal() > 0.99) * np.sign(y_diff)])
-
-        self.add_position(self.get_velocity())
-
-        pos = self.get_position()
-        _h, _w = self.get_shape()
-
-        self.set_position([pos[0], min(config.MAX_HEIGHT - _h, pos[1])])
-
-        pos = self.get_position()
-        _h, _w = self.get_shape()
+        self.set_velocity([self.get_velocity()[0], homing * np.sign(y_diff)])
 
-        return self.get_active() and \
-            pos[0] + _w >= 0 and \
-            pos[0] + _w <= config.WIDTH
+        return super().update()
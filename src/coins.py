@@ -3,23 +3,24 @@ This file contains the code necessary for coins
 """
 
 import numpy as np
-import colorama as col
 
 from objects import GameObject
-import util
-import config
+import sprites
 
 class Coin(GameObject):
     """
     This class is for the coin
     """
 
+    __slots__ = ()
+
+    VELOCITY = np.array([-2., 0.])
+
     def __init__(self, position):
-        rep = np.array([["$"]])
+        rep, color = sprites.get("coin")
 
-        super().__init__(rep, position, np.array([-2., 0.]), \
-                   np.array([0., 0.]), 0, util.tup_to_array((1, 1), \
-                   (col.Back.YELLOW, col.Fore.RED)))
+        super().__init__(rep, position, Coin.VELOCITY.copy(), \
+                   np.array([0., 0.]), 0, color)
 
     def update(self):
         """
@@ -28,15 +29,7 @@ class Coin(GameObject):
         Returns:
             bool : Should the object be rendered in the next frame
         """
-        vel = self.get_velocity()
-        self.add_velocity(np.array([np.sign(vel[0]) * config.BOOST_ACTIVE, 0.]))
-
-        self.add_position(self.get_velocity())
-
-        pos = self.get_position()
-        _, _w = self.get_shape()
-
-        return self.get_active() and pos[0] + _w >= 0
+        return self.drift()
 
 class Coins:
     """
@@ -62,14 +55,12 @@ class Coins:
         miny = int(miny)
         maxy = int(maxy)
 
-        self.coins = []
-
-        for _x in range(minx, maxx):
-            for _y in range(miny, maxy):
-                self.coins.append(Coin(np.array((_x, _y), dtype='float64')))
+        # x major order, same as the coins used to be created in
+        _x, _y = np.meshgrid(np.arange(minx, maxx), np.arange(miny, maxy), indexing="ij")
+        self.positions = np.stack((_x.ravel(), _y.ravel()), axis=1).astype("float64")
 
-    def get_items(self):
+    def get_positions(self):
         """
-        Returns all the coins
+        Returns the [x, y] of every coin as a (n, 2) array
         """
-        return self.coins
+        return self.positions
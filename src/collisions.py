@@ -0,0 +1,153 @@
+"""
+This file contains collision detection
+
+The screen is split into a uniform grid and every box is filed under the
+cells it covers. Only boxes sharing a cell are tested against each other.
+
+Every group of objects is a layer with a bit of its own. The rules of who
+collides with whom are compiled once into a response table, and find_hits()
+yields the overlapping pairs of every rule whose layers are all present, one
+rule at a time, so that each rule sees the responses to the ones before it.
+"""
+
+import numpy as np
+
+import config
+import util
+
+# cell coordinates are packed into one key, x is offset so it can't be negative
+_X_OFFSET = 1 << 16
+_Y_STRIDE = 1 << 17
+
+
+def cell_keys(boxes, cell=None):
+    """
+    Finds the grid cells covered by every box
+
+    Args:
+        boxes (n x 4 np.array) : Boxes as rows of [x, y, h, w]
+        cell (int)             : Size of a cell, config.GRID_CELL by default
+
+    Returns:
+        (1D np.array, 1D np.array) : Key of each covered cell, and the row
+                                     of the box covering it
+    """
+    cell = cell or config.GRID_CELL
+
+    xs, ys, hs, ws = boxes.T
+
+    # inclusive cell ranges, erring on the side of one cell too many
+    cx0 = np.floor(xs / cell).astype(np.int64)
+    cy0 = np.floor(ys / cell).astype(np.int64)
+    nx = np.floor((xs + ws) / cell).astype(np.int64) - cx0 + 1
+    ny = np.floor((ys + hs) / cell).astype(np.int64) - cy0 + 1
+
+    counts = nx * ny
+    rows = np.repeat(np.arange(len(boxes)), counts)
+
+    # position of each cell within its box
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    cx = cx0[rows] + local % nx[rows]
+    cy = cy0[rows] + local // nx[rows]
+
+    return cy * _Y_STRIDE + cx + _X_OFFSET, rows
+
+
+def colliding_pairs(boxes_a, boxes_b, cell=None):
+    """
+    Finds every pair of overlapping boxes between boxes_a and boxes_b
+
+    Args:
+        boxes_a (n x 4 np.array) : Boxes as rows of [x, y, h, w]
+        boxes_b (m x 4 np.array) : Boxes as rows of [x, y, h, w]
+        cell (int)               : Size of a cell, config.GRID_CELL by default
+
+    Returns:
+        (1D np.array, 1D np.array) : Rows in boxes_a and boxes_b of each
+                                     overlapping pair, sorted by the row in
+                                     boxes_a and then by the row in boxes_b
+    """
+    empty = np.zeros(0, dtype=np.int64)
+    if not len(boxes_a) or not len(boxes_b):
+        return empty, empty
+
+    keys_a, rows_a = cell_keys(boxes_a, cell)
+    keys_b, rows_b = cell_keys(boxes_b, cell)
+
+    order = np.argsort(keys_b, kind="stable")
+    keys_b = keys_b[order]
+    rows_b = rows_b[order]
+
+    # every cell of a is matched with the run of equal keys in b
+    beg = np.searchsorted(keys_b, keys_a, side="left")
+    counts = np.searchsorted(keys_b, keys_a, side="right") - beg
+
+    pair_a = np.repeat(rows_a, counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    pair_b = rows_b[np.repeat(beg, counts) + local]
+
+    # boxes sharing several cells show up several times
+    code = np.unique(pair_a * len(boxes_b) + pair_b)
+    pair_a, pair_b = code // len(boxes_b), code % len(boxes_b)
+
+    hit = util.overlaps(boxes_a[pair_a], boxes_b[pair_b])
+
+    return pair_a[hit], pair_b[hit]
+
+
+def layers(names):
+    """
+    Gives every name a bit of its own
+
+    Args:
+        names (iterable) : Names of the layers
+
+    Returns:
+        dict : name -> bit
+    """
+    return {name: 1 << i for i, name in enumerate(names)}
+
+
+def compile_rules(colliders, bits, scores):
+    """
+    Compiles the collision rules into a response table
+
+    Args:
+        colliders (list) : (x, y, z) rules, x destroys y on collision and
+                           y destroys x if z
+        bits (dict)      : Bit of every layer, see layers()
+        scores (dict)    : Score for every object of a layer destroyed
+
+    Returns:
+        list : (hitter, target, mask, score, mutual) for every rule, where
+               mask has the bits of both layers
+    """
+    return [(hitter, target, bits[hitter] | bits[target], scores.get(target, 0), mutual)
+            for hitter, target, mutual in colliders]
+
+
+def find_hits(rules, groups, present):
+    """
+    Finds the overlapping pairs of every rule, a rule at a time
+
+    The pairs of a rule are only found once the caller asks for them, with
+    the groups as they are then, so responses to the rules before it are
+    seen, even when they replace a group in groups.
+
+    Args:
+        rules (list)  : The response table, see compile_rules()
+        groups (dict) : Groups of objects by layer, with boxes()
+        present (int) : Bits of the layers which aren't empty
+
+    Yields:
+        (rule, hitter rows, target rows) for every rule with hits, the rows
+        sorted like colliding_pairs() sorts them
+    """
+    for k, (hitter, target, mask, _, _) in enumerate(rules):
+        if present & mask != mask:
+            continue
+
+        hit_h, hit_t = colliding_pairs(groups[hitter].boxes(), groups[target].boxes())
+        if len(hit_t):
+            yield k, hit_h, hit_t
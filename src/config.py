@@ -3,32 +3,169 @@ This file is supposed to contain all configuration parameters
 """
 
 import os
+import sys
+import contextlib
 import colorama as col
 
-SCREEN_HEIGHT, SCREEN_WIDTH = [int(x) for x in os.popen("stty size", "r").read().split()]
+# (rows, columns) used when there is no terminal, e.g. in headless mode
+DEFAULT_SCREEN = (40, 130)
 
-WIDTH = SCREEN_WIDTH - 10
-HEIGHT = SCREEN_HEIGHT - 5
+# smallest (rows, columns) the game is laid out for, the frame can't be
+# shown on a smaller terminal
+MIN_SCREEN = (24, 80)
 
 GROUND_HEIGHT = 5
 
 MIN_HEIGHT = SCOREBOARD_HEIGHT = 3
-MAX_HEIGHT = HEIGHT - GROUND_HEIGHT
+
+
+def terminal_size():
+    """
+    Returns the (rows, columns) of the terminal, DEFAULT_SCREEN without one
+
+    The size is asked for with an ioctl on stdout (or stdin), which is
+    cheap enough to do again whenever the terminal is resized.
+    """
+    for stream in (sys.stdout, sys.stdin):
+        try:
+            columns, rows = os.get_terminal_size(stream.fileno())
+        except (AttributeError, ValueError, OSError):
+            continue
+
+        if rows and columns:
+            return (rows, columns)
+
+    return DEFAULT_SCREEN
+
+
+def fits(rows, columns):
+    """
+    Returns whether the game can be laid out on a terminal of this size
+    """
+    return rows >= MIN_SCREEN[0] and columns >= MIN_SCREEN[1]
+
+
+def too_small_message(rows, columns):
+    """
+    Returns what to tell the player when the terminal doesn't fit()
+    """
+    return (f"The terminal is {columns}x{rows}, the game needs at least "
+            f"{MIN_SCREEN[1]}x{MIN_SCREEN[0]}")
+
+
+def layout(rows, columns):
+    """
+    Returns the size of the terminal and everything which depends on it,
+    NAME -> value like override() takes them
+    """
+    height = rows - 5
+
+    return {
+        "SCREEN_HEIGHT": rows,
+        "SCREEN_WIDTH": columns,
+        "WIDTH": columns - 10,
+        "HEIGHT": height,
+        "MAX_HEIGHT": height - GROUND_HEIGHT
+    }
+
+
+def set_screen_size(rows, columns):
+    """
+    Sets the size of the terminal and everything which depends on it
+    """
+    globals().update(layout(rows, columns))
+
+
+# a terminal which is too small is refused by the game (see main.py),
+# headless games are still laid out at the smallest size
+set_screen_size(*(max(size, least) for size, least in zip(terminal_size(), MIN_SCREEN)))
+
+
+@contextlib.contextmanager
+def override(**values):
+    """
+    Temporarily changes configuration parameters, e.g. for one game of a batch
+
+    Args:
+        values : NAME=value for each parameter to change
+    """
+    unknown = [key for key in values if key not in globals()]
+    if unknown:
+        raise KeyError(f"unknown config parameters: {', '.join(unknown)}")
+
+    old = {key: globals()[key] for key in values}
+    globals().update(values)
+
+    try:
+        yield
+    finally:
+        globals().update(old)
+
+# terminal row (1-indexed) where the frame starts, below the scoreboard
+SCREEN_TOP = SCOREBOARD_HEIGHT + 2
 
 DRAG_CONST = 0.05
 
+# past this many regions drawn over, a frame is cleared in one go
+DIRTY_MAX = 256
+
+# size of the cells of the collision grid
+GRID_CELL = 8
+
 # default colors
 BG_COL = col.Back.BLUE
 FG_COL = col.Fore.BLACK
 
 BG_GROUND = col.Back.GREEN
 
-# delay bw frame updates
+# delay bw frame updates, i.e. the length of one tick
 DELAY = 0.05
 
+# ticks run back to back before giving up on catching up
+MAX_CATCHUP = 5
+
+# chance of each obstacle spawning on a tick
+FIREBEAM_PROB = 0.05
+MAGNET_PROB = 0.01
+COINS_PROB = 0.1
+
+# ticks of spawns drawn at once by the spawn scheduler, and how many
+# such batches it keeps ready ahead of the game
+SPAWN_BATCH = 1024
+SPAWN_LOOKAHEAD = 4
+
+# pull of a magnet, and the groups of objects it pulls on. "mandalorian"
+# is the Mandalorian alone, "player" would be the Dragon while it is out
+MAGNET_STRENGTH = 0.3
+MAGNET_TARGETS = ("mandalorian",)
+
+# score for every coin collected and every fire beam shot down
+COIN_SCORE = 10
+BEAM_SCORE = 30
+
 # FireBeam orientations
 FIREBEAM_MAX = 4
 
+# where the spectator server listens, only local connections by default
+SPECTATE_HOST = "127.0.0.1"
+SPECTATE_PORT = 7777
+
+# most spectators at once, and bytes queued for one before it is skipped
+# frames instead
+SPECTATORS_MAX = 64
+SPECTATE_BUFFER = 1 << 16
+
+# frames handed at once to the thread writing a recording, and how many
+# such batches may wait for it
+CAST_BATCH = 32
+CAST_QUEUE = 16
+
+# most free objects kept in each object pool
+POOL_MAX = 64
+
+# frames cached for one period of the dragon's wave
+DRAGON_PHASES = 64
+
 DEBUG = False
 DEBUG_ALL = False
 
@@ -42,6 +179,7 @@ SHIELD_CHAR = " "
 SPEEDOOST_CHAR = "s"
 QUIT_CHAR = "q"
 DRAGON_CHAR = "f"
+PROFILER_CHAR = "p"
 
 SPEEDOOST_ACTIVE = False
 
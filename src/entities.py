@@ -0,0 +1,306 @@
+"""
+This file contains the containers the game keeps its objects in
+
+Every kind of object lives in a group with the same interface:
+    ObjectGroup : a list of GameObjects, for one-off objects like the player
+    EntityStore : struct-of-arrays storage for homogeneous objects like
+                  coins, bullets and beams, updated in vectorized passes
+"""
+
+import numpy as np
+
+import config
+import pools
+
+
+def _grow(arr, capacity, count):
+    """
+    Returns a copy of arr with capacity rows, keeping the first count rows
+    """
+    new = np.zeros((capacity,) + arr.shape[1:], dtype=arr.dtype)
+    new[:count] = arr[:count]
+
+    return new
+
+
+class ObjectGroup:
+    """
+    A group of GameObjects, each one updated through its own update()
+    """
+
+    def __init__(self, objects=()):
+        """
+        Constructor for ObjectGroup
+
+        Args:
+            objects (list) : Initial GameObjects in the group
+        """
+        self.__objects = list(objects)
+
+    def __len__(self):
+        return len(self.__objects)
+
+    def __iter__(self):
+        return iter(self.__objects)
+
+    def add(self, obj):
+        """
+        Adds a GameObject to the group
+        """
+        self.__objects.append(obj)
+
+    def update(self):
+        """
+        Updates every object, dropping the ones which are done and giving
+        them back to their pools
+        """
+        objects = []
+
+        for obj in self.__objects:
+            if obj.update():
+                objects.append(obj)
+            else:
+                pools.release(obj)
+
+        self.__objects = objects
+
+    def draw(self, screen, frame=0):
+        """
+        Draws every object on the screen
+        """
+        for obj in self.__objects:
+            screen.draw(obj, frame)
+
+    def boxes(self):
+        """
+        Returns the bounding boxes as a (n, 4) array of [x, y, h, w]
+        """
+        return np.array([[*obj.get_position(), *obj.get_shape()]
+                         for obj in self.__objects], dtype="float64").reshape(-1, 4)
+
+    def positions(self):
+        """
+        Returns the positions as a (n, 2) array of [x, y]
+        """
+        return np.array([obj.get_position() for obj in self.__objects],
+                        dtype="float64").reshape(-1, 2)
+
+    def accelerate(self, dv):
+        """
+        Adds a (n, 2) array of [vx, vy] to the velocities
+        """
+        for obj, _dv in zip(self.__objects, dv):
+            obj.add_velocity(_dv)
+
+    def destroy(self, indices):
+        """
+        Calls destroy() on the objects at the given indices
+        """
+        for i in indices:
+            self.__objects[i].destroy()
+
+
+class EntityStore:
+    """
+    Struct-of-arrays storage for one kind of simple moving object
+
+    Positions, velocities, shapes, sprites and active flags are kept in
+    contiguous arrays. Live entities always occupy the first rows, so that
+    update, culling and compaction are each one vectorized pass.
+    """
+
+    def __init__(self, capacity=64, bounded=False, target=None, rng=None):
+        """
+        Constructor for EntityStore
+
+        Args:
+            capacity (int)      : Initial number of rows, grows as needed
+            bounded (bool)      : Behave like bullets, i.e. stay above the
+                                  ground and vanish past the right edge
+            target (GameObject) : Object to home in on vertically, like
+                                  the DragonBossBullet does
+            rng                 : Random numbers for homing in, anything
+                                  with normal(size) like a Generator
+        """
+        self.__pos = np.zeros((capacity, 2))
+        self.__vel = np.zeros((capacity, 2))
+        self.__shape = np.zeros((capacity, 2))
+        self.__sprite = np.zeros(capacity, dtype=int)
+        self.__active = np.zeros(capacity, dtype=bool)
+        self.__count = 0
+        self.__high_water = 0
+
+        # sprites are shared read-only arrays, so they are told apart by id
+        self.__sprites = []
+        self.__sprite_ids = {}
+
+        self.__bounded = bounded
+        self.__target = target
+        self.__rng = rng or np.random.default_rng()
+
+    def __len__(self):
+        return self.__count
+
+    def __reserve(self, count):
+        """
+        Makes sure there is space for count more rows
+        """
+        capacity = len(self.__active)
+        if self.__count + count <= capacity:
+            return
+
+        capacity = max(2 * capacity, self.__count + count)
+
+        self.__pos = _grow(self.__pos, capacity, self.__count)
+        self.__vel = _grow(self.__vel, capacity, self.__count)
+        self.__shape = _grow(self.__shape, capacity, self.__count)
+        self.__sprite = _grow(self.__sprite, capacity, self.__count)
+        self.__active = _grow(self.__active, capacity, self.__count)
+
+    def __sprite_index(self, sprite):
+        """
+        Returns the index of the sprite (rep, color), adding it if needed
+        """
+        key = id(sprite[0])
+        if key not in self.__sprite_ids:
+            self.__sprite_ids[key] = len(self.__sprites)
+            self.__sprites.append(sprite)
+
+        return self.__sprite_ids[key]
+
+    def spawn(self, positions, velocity, sprite):
+        """
+        Adds entities which all look alike
+
+        Args:
+            positions (n x 2 np.array) : [x, y] of each new entity
+            velocity [vx, vy]          : Velocity of the new entities
+            sprite (rep, color)        : How the new entities look
+        """
+        positions = np.asarray(positions, dtype="float64").reshape(-1, 2)
+        count = len(positions)
+
+        self.__reserve(count)
+
+        beg, end = self.__count, self.__count + count
+
+        self.__pos[beg:end] = positions
+        self.__vel[beg:end] = velocity
+        self.__shape[beg:end] = sprite[0].shape
+        self.__sprite[beg:end] = self.__sprite_index(sprite)
+        self.__active[beg:end] = True
+
+        self.__count = end
+        self.__high_water = max(self.__high_water, end)
+
+    def add(self, obj):
+        """
+        Takes over a GameObject, its state lives in the store from now on
+        """
+        self.spawn(obj.get_position(), obj.get_velocity(), obj.get_rep())
+
+    def update(self):
+        """
+        Moves all the entities and drops the ones which are done
+        """
+        count = self.__count
+        pos = self.__pos[:count]
+        vel = self.__vel[:count]
+        height, width = self.__shape[:count].T
+
+        vel[:, 0] += np.sign(vel[:, 0]) * config.BOOST_ACTIVE
+
+        if self.__target is not None:
+            y_diff = self.__target.get_position()[1] - pos[:, 1]
+            vel[:, 1] = (self.__rng.normal(size=count) > 0.99) * np.sign(y_diff)
+
+        pos += vel
+
+        alive = self.__active[:count] & (pos[:, 0] + width >= 0)
+
+        if self.__bounded:
+            np.minimum(pos[:, 1], config.MAX_HEIGHT - height, out=pos[:, 1])
+            alive &= pos[:, 0] + width <= config.WIDTH
+
+        self.compact(alive)
+
+    def compact(self, keep):
+        """
+        Moves the rows marked in keep to the front, dropping the rest
+
+        Args:
+            keep (1D np.array) : bool for each of the live rows
+        """
+        if keep.all():
+            return
+
+        rows = np.flatnonzero(keep)
+        count = len(rows)
+
+        self.__pos[:count] = self.__pos[rows]
+        self.__vel[:count] = self.__vel[rows]
+        self.__shape[:count] = self.__shape[rows]
+        self.__sprite[:count] = self.__sprite[rows]
+        self.__active[:count] = True
+        self.__active[count:self.__count] = False
+
+        self.__count = count
+
+    def draw(self, screen, frame=0):
+        """
+        Draws every entity on the screen
+        """
+        count = self.__count
+        if count == 0:
+            return
+
+        xs = self.__pos[:count, 0].astype(int)
+        ys = self.__pos[:count, 1].astype(int)
+        sprite = self.__sprite[:count]
+
+        # 1x1 sprites (coins) are scattered in one go, the rest are blitted
+        is_point = np.array([rep.shape == (1, 1) for rep, _ in self.__sprites])[sprite]
+
+        for idx in np.unique(sprite[is_point]):
+            rep, color = self.__sprites[idx]
+            rows = np.flatnonzero(sprite == idx)
+            screen.draw_points(xs[rows], ys[rows], rep[0, 0], color[0, 0])
+
+        for row in np.flatnonzero(~is_point):
+            rep, color = self.__sprites[sprite[row]]
+            screen.blit(rep, color, xs[row], ys[row])
+
+    def get_stats(self):
+        """
+        Returns the number of live entities, the most there have been at
+        once and the number of rows allocated
+        """
+        return {
+            "count": self.__count,
+            "high_water": self.__high_water,
+            "capacity": len(self.__active)
+        }
+
+    def boxes(self):
+        """
+        Returns the bounding boxes as a (n, 4) array of [x, y, h, w]
+        """
+        return np.hstack((self.__pos[:self.__count], self.__shape[:self.__count]))
+
+    def positions(self):
+        """
+        Returns the positions as a (n, 2) array of [x, y]
+        """
+        return self.__pos[:self.__count].copy()
+
+    def accelerate(self, dv):
+        """
+        Adds a (n, 2) array of [vx, vy] to the velocities
+        """
+        self.__vel[:self.__count] += dv
+
+    def destroy(self, indices):
+        """
+        Marks the entities at the given indices for destruction
+        """
+        self.__active[indices] = False
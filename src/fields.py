@@ -0,0 +1,86 @@
+"""
+This file contains the force fields
+
+Magnets, and anything else which pulls on other objects, emit() a field
+when they update. Once per tick apply() works out the force of every field
+on every object of the groups it affects, in one NumPy pass per group, and
+adds it to their velocities.
+
+A field at M of strength s pulls an object at P with
+
+    s * (M - P) / (|M - P| + 1)
+
+so it is about s far away and fades out close to its source.
+"""
+
+import numpy as np
+
+
+def pull(bodies, sources, strengths):
+    """
+    Returns the force of the fields on each body
+
+    Args:
+        bodies (n x 2 np.array)  : [x, y] of each body
+        sources (m x 2 np.array) : [x, y] of each field
+        strengths (m np.array)   : Strength of each field
+
+    Returns:
+        n x 2 np.array : The summed force on each body
+    """
+    diff = sources[np.newaxis, :, :] - bodies[:, np.newaxis, :]
+    dist = np.sqrt((diff * diff).sum(axis=2)) + 1
+
+    return (strengths[np.newaxis, :, np.newaxis] * diff / dist[:, :, np.newaxis]).sum(axis=1)
+
+
+class ForceFields:
+    """
+    The fields emitted during a tick
+    """
+
+    def __init__(self):
+        self.__sources = []
+        self.__strengths = []
+        self.__targets = []
+
+    def __len__(self):
+        return len(self.__sources)
+
+    def emit(self, position, strength, targets):
+        """
+        Adds a field for the next apply()
+
+        Args:
+            position [px, py] : Where the field comes from
+            strength (float)  : Strength of the field, negative pushes away
+            targets (tuple)   : Names of the groups the field acts on
+        """
+        self.__sources.append(position)
+        self.__strengths.append(strength)
+        self.__targets.append(targets)
+
+    def apply(self, groups):
+        """
+        Accelerates the objects in the fields, and clears the fields
+
+        Args:
+            groups (dict) : Groups of objects in the game, by type
+        """
+        if not self.__sources:
+            return
+
+        sources = np.array(self.__sources, dtype="float64")
+        strengths = np.array(self.__strengths, dtype="float64")
+
+        for name in dict.fromkeys(name for targets in self.__targets for name in targets):
+            group = groups.get(name)
+            if not group:
+                continue
+
+            mask = np.array([name in targets for targets in self.__targets])
+            group.accelerate(pull(group.positions(), sources[mask], strengths[mask]))
+
+        self.__sources.clear()
+        self.__strengths.clear()
+        self.__targets.clear()
@@ -3,15 +3,28 @@ This file contains the code which runs the game
 """
 
 import time
+import signal
+import secrets
 import numpy as np
 import colorama as col
 
-from screen import Screen
+from screen import Screen, NullScreen, write_frame
+from render_worker import WorkerScreen
+from spectate import SpectatorServer
+from asciicast import CastWriter
 from player import Mandalorian, DragonBoss, Dragon
 from objects import Ground
 from obstacles import FireBeam, Magnet
-from coins import Coins
+from bullets import MandalorianBullet, DragonBossBullet
+from coins import Coin, Coins
+from entities import ObjectGroup, EntityStore
+from profiler import Profiler, NullProfiler
+from spawner import SpawnScheduler
+from fields import ForceFields
 import graphics
+import sprites
+import collisions
+import pools
 from background import Falcon
 
 import config
@@ -22,32 +35,86 @@ class Game:
     This class manages the whole Game
     """
 
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, profiler=None, render_process=False,
+                 spectate=None, cast=None):
         """
         Constructor for the Game
+
+        Args:
+            headless (bool) : Run without a terminal, nothing is drawn or
+                              printed and the game is driven through tick()
+            seed (int)      : Seed for all the randomness in the game, the
+                              same seed and keys play out the same game
+            profiler (Profiler) : Times every phase of every frame, the
+                                  overlay is shown from the start if given
+            render_process (bool) : Encode and write the frames in another
+                                    process, a slow terminal then drops
+                                    frames instead of slowing the game
+            spectate (int) : Port to stream the frames to spectators on,
+                             see spectate.py
+            cast (str)     : Record the frames shown to this asciicast file,
+                             see asciicast.py, not with render_process
         """
+        self.__headless = headless
+
+        # set once the game is built, till then __del__ leaves the terminal be
+        self.__ready = False
+
+        # left over from a previous game in the same process
+        config.BOOST_ACTIVE = 0
+
+        self.__seed = secrets.randbits(63) if seed is None else seed
+        # spawns and the boss's homing are drawn ahead on another thread
+        self.__scheduler = SpawnScheduler(self.__seed)
+
+        self.__screen = NullScreen()
+        self.__cast = None
+
+        # listening and opening the recording can fail, so they are done
+        # before the terminal is touched
+        self.__spectators = None
+        if spectate is not None and not headless:
+            self.__spectators = SpectatorServer(spectate)
+
+        if cast is not None and not headless:
+            self.__cast = CastWriter(cast, config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+
+        if not headless:
+            # hide the cursor and clear the screen
+            print("\033[?25l\033[2J", end='')
 
-        # hide the cursor and clear the screen
-        print("\033[?25l\033[2J", end='')
+            self.__screen = WorkerScreen() if render_process else Screen()
 
-        _t = time.time()
+            if self.__cast is not None:
+                self.__screen.set_cast(self.__cast)
 
-        self.__screen = Screen()
+        # the ground never changes, so it is drawn once into the static layer
         self.__ground = Ground()
+        self.__screen.bake(self.__ground)
 
         self.__player = Mandalorian(self)
         self.__dragon = Dragon(self)
         self.__dragon_boss = DragonBoss(self)
 
         self.__score = 0
-        self.__init_time = _t
 
-        self.__frame_count = 0
+        # the game runs on its own clock, which advances by config.DELAY
+        # every tick no matter how long the tick took
+        self.__tick = 0
+
+        # frames shown, and the achieved tick / frame rates
+        self.__frames = 0
+        self.__rate_start = (time.perf_counter(), 0, 0)
+        self.__tick_rate = self.__frame_rate = 0.
+
+        # the profiler, and whether its overlay is shown
+        self.__profiler = profiler or NullProfiler()
+        self.__show_profile = profiler is not None
 
         self.__shield_active = False
         self.__shield_recharging = True
         self.__last_shield = -1
-        self.__last_shield_charge = _t
+        self.__last_shield_charge = 0
 
         self.__last_boost = -1
 
@@ -57,16 +124,33 @@ class Game:
         self.__boss_mode = False
         self.__over = False
 
+        # emitted by magnets as they update, and applied right after
+        self.__fields = ForceFields()
+
+        # the Mandalorian, as a group fields can target even while the
+        # Dragon stands in for it as "player"
+        self.__mandalorian = ObjectGroup([self.__player])
+
+        # set by SIGWINCH, the resize itself waits for the next frame
+        self.__resized = False
+
+        # the terminal got smaller than config.MIN_SCREEN, the game waits
+        # till it is made bigger again
+        self.__too_small = False
+
         # seperate them into different classes
+        # coins, beams and bullets are many and alike, so they are kept in
+        # struct-of-arrays stores, everything else is a list of GameObjects
         self.__objects = {
-            "background": [self.__ground],
-            "beams": [],
-            "magnets": [],
-            "player": [self.__player],
-            "boss": [],
-            "boss_bullet": [],
-            "player_bullet": [],
-            "coins": []
+            "background": ObjectGroup(),
+            "beams": EntityStore(),
+            "magnets": ObjectGroup(),
+            "player": ObjectGroup([self.__player]),
+            "boss": ObjectGroup(),
+            "boss_bullet": EntityStore(bounded=True, target=self.__player,
+                                       rng=self.__scheduler),
+            "player_bullet": EntityStore(bounded=True),
+            "coins": EntityStore(capacity=256)
         }
 
         # (x, y, z)
@@ -82,117 +166,341 @@ class Game:
             ("boss_bullet", "player", True)
         ]
 
+        # compiled once, every group is a collision layer
+        self.__layers = collisions.layers(self.__objects)
+        self.__rules = collisions.compile_rules(
+            self.__colliders, self.__layers,
+            {"coins": config.COIN_SCORE, "beams": config.BEAM_SCORE})
+
+        self.__ready = True
+
     def clear(self):
         """
-        Clears the screen and the frame
+        Clears the frame
         """
         self.__screen.clear()
-        util.clear()
 
-    def start(self):
+    def start(self, kb_inp=None, speed=1., follow_resize=True):
         """
         Starts the game
+
+        Ticks run at a fixed rate of one per config.DELAY seconds. If the
+        game falls behind, it runs up to config.MAX_CATCHUP ticks back to
+        back and skips rendering the frames in between.
+
+        Args:
+            kb_inp        : Where keys come from, the keyboard (KBHit) by default
+            speed (float) : How many times faster than real time to run
+            follow_resize (bool) : Fit the game to the terminal when it is
+                                   resized, recorded and replayed games keep
+                                   their size so that they play out the same
         """
-        kb_inp = util.KBHit()
+        kb_inp = kb_inp or util.KBHit()
+        period = config.DELAY / speed
+
+        handler = None
+        if follow_resize and hasattr(signal, "SIGWINCH"):
+            handler = signal.signal(signal.SIGWINCH, self.on_resize)
+
+        try:
+            self.run(kb_inp, period)
+        finally:
+            if handler is not None:
+                signal.signal(signal.SIGWINCH, handler)
 
-        while True:
-            if time.time() - self.__init_time > config.TOTAL_TIME:
-                self.__over = True
+            self.close()
 
-            if self.__over:
-                break
+    def run(self, kb_inp, period):
+        """
+        The game loop of start()
+        """
+        next_tick = time.perf_counter()
 
-            if self.__frame_count == 300:
-                self.__objects["background"].append(Falcon())
+        while not self.__over:
+            if self.__too_small:
+                if self.__resized:
+                    self.resize()
 
-            self.__frame_count += 1
-            time.sleep(config.DELAY)
+                # the time and keys of the pause don't count
+                kb_inp.wait_until(time.perf_counter() + period)
+                kb_inp.keys()
+                next_tick = time.perf_counter()
+                continue
 
-            if not self.__boss_mode:
-                self.__score += config.DELAY + config.SPEEDOOST_ACTIVE
-
-            if self.__score >= config.BOSS_MIN_SCORE:
-                if not self.__boss_mode:
-                    self.__objects["boss"] = [self.__dragon_boss]
-                    self.deactivate_dragon()
-
-                self.__boss_mode = True
-
-            self.update_shield()
-            self.update_boost()
-
-            tmp_obj = {
-                "background": [],
-                "beams": [],
-                "magnets": [],
-                "player": [],
-                "boss": [],
-                "boss_bullet": [],
-                "player_bullet": [],
-                "coins": []
-            }
-
-            if kb_inp.kbhit():
-                if self.manage_keys(kb_inp.getch()):
+            ticks = 0
+
+            while time.perf_counter() >= next_tick and not self.__over:
+                if self.tick(kb_inp):
+                    return
+
+                next_tick += period
+                ticks += 1
+
+                if ticks == config.MAX_CATCHUP:
+                    # too far behind, give up on the lost time
+                    next_tick = time.perf_counter()
                     break
+
+            if self.__resized:
+                self.resize()
+
+            if ticks:
+                self.render()
             else:
-                kb_inp.clear()
+                # keys which come in while waiting are queued for the next tick
+                kb_inp.wait_until(next_tick)
+                self.__profiler.lap("idle")
+
+    def tick(self, kb_inp):
+        """
+        Advances the game by one step of config.DELAY seconds
+
+        Args:
+            kb_inp (KBHit) : The keyboard
+
+        Returns:
+            bool : Should the game quit?
+        """
+        if self.get_time() > config.TOTAL_TIME:
+            self.__over = True
+            return False
+
+        if self.__tick == 300:
+            self.__objects["background"].add(Falcon())
 
-            self.clear()
+        self.__tick += 1
 
+        if not self.__boss_mode:
+            self.__score += config.DELAY + config.SPEEDOOST_ACTIVE
+
+        if self.__score >= config.BOSS_MIN_SCORE:
             if not self.__boss_mode:
-                self.spawn_obstacles()
+                self.__objects["boss"] = ObjectGroup([self.__dragon_boss])
+                self.deactivate_dragon()
+
+            self.__boss_mode = True
+
+        self.update_shield()
+        self.update_boost()
+
+        for key in kb_inp.keys():
+            if self.manage_keys(key):
+                return True
+
+        self.__profiler.lap("input")
+
+        if not self.__boss_mode:
+            self.spawn_obstacles()
+
+        self.__profiler.lap("spawn")
+
+        self.detect_collisions()
+
+        self.__profiler.lap("collisions")
+
+        # the magnets pull on the others before they move
+        self.__objects["magnets"].update()
+        self.apply_fields()
+
+        for name, group in self.__objects.items():
+            if name != "magnets":
+                group.update()
+
+        self.__profiler.lap("update")
+
+        return False
+
+    def render(self):
+        """
+        Draws the current state of the game on the screen
+        """
+        self.clear()
+
+        for group in self.__objects.values():
+            group.draw(self.__screen, self.__tick)
+
+        self.__profiler.lap("draw")
+
+        self.__frames += 1
+        self.measure_rates()
+
+        self.show_score()
+        self.__profiler.lap("hud")
+
+        if self.__spectators is not None:
+            self.__spectators.publish(self.__screen.display, self.__screen.color,
+                                      self.__screen.hud)
+
+        self.__screen.show()
+        self.__profiler.lap("write")
+
+        self.__profiler.end_frame(self.__objects)
+
+    def on_resize(self, _signum, _frame):
+        """
+        SIGWINCH handler, only notes that the terminal was resized
+        """
+        self.__resized = True
+
+    def resize(self):
+        """
+        Fits the game to the terminal's new size
+
+        The screen, the ground and the positions which depend on the size
+        are changed in place, and the next frame is fully repainted.
+        Spawning and culling read the size from config, so they follow.
+        A terminal smaller than config.MIN_SCREEN pauses the game instead.
+        """
+        self.__resized = False
+
+        rows, columns = config.terminal_size()
+        self.__too_small = not config.fits(rows, columns)
+
+        if self.__too_small:
+            write_frame(f"\033[2J\033[1;1H{col.Style.RESET_ALL}"
+                        + config.too_small_message(rows, columns)[:columns])
+            return
+
+        config.set_screen_size(rows, columns)
+
+        self.__screen.resize()
+        self.__ground.resize()
+        self.__screen.bake(self.__ground)
+
+        self.__player.init_pos[1] = config.MAX_HEIGHT
+        self.__dragon_boss.set_position([config.WIDTH - 50, self.__dragon_boss.get_y()])
+
+    def measure_rates(self):
+        """
+        Updates the achieved tick and frame rates about once a second
+        """
+        _t = time.perf_counter()
+        start, ticks, frames = self.__rate_start
+
+        if _t - start >= 1:
+            self.__tick_rate = (self.__tick - ticks) / (_t - start)
+            self.__frame_rate = (self.__frames - frames) / (_t - start)
+            self.__rate_start = (_t, self.__tick, self.__frames)
+
+    def get_objects(self):
+        """
+        Returns the groups of objects in the game, by type
+        """
+        return self.__objects
+
+    def get_screen(self):
+        """
+        Returns the screen the game is drawn on
+        """
+        return self.__screen
+
+    def get_fields(self):
+        """
+        Returns the force fields of the current tick
+        """
+        return self.__fields
+
+    def apply_fields(self):
+        """
+        Applies the force fields emitted this tick to the groups they target
+        """
+        self.__fields.apply(dict(self.__objects, mandalorian=self.__mandalorian))
+
+    def get_profiler(self):
+        """
+        Returns the profiler timing the game
+        """
+        return self.__profiler
+
+    def toggle_profile(self):
+        """
+        Shows or hides the profiler's overlay, profiling from now on if
+        the game wasn't being profiled
+        """
+        if isinstance(self.__profiler, NullProfiler):
+            self.__profiler = Profiler()
+
+        self.__show_profile = not self.__show_profile
+
+    def get_scheduler(self):
+        """
+        Returns the game's spawn scheduler, which also hands out normals
+        """
+        return self.__scheduler
 
-            self.detect_collisions()
+    def get_seed(self):
+        """
+        Returns the seed the game was started with
+        """
+        return self.__seed
+
+    def get_tick(self):
+        """
+        Returns the number of ticks run so far
+        """
+        return self.__tick
 
-            for obj_type in self.__objects:
-                for obj in self.__objects[obj_type]:
-                    if obj.update():
-                        self.__screen.draw(obj, self.__frame_count)
-                        tmp_obj[obj_type].append(obj)
+    def get_over(self):
+        """
+        Returns whether the game is over
+        """
+        return self.__over
 
-            self.__objects = tmp_obj
+    def get_stats(self):
+        """
+        Returns a summary of how the game went
+        """
+        return {
+            "seed": self.__seed,
+            "score": int(self.__score),
+            "ticks": self.__tick,
+            "time": self.get_time(),
+            "lives": self.__player.get_lives(),
+            "boss_mode": self.__boss_mode,
+            "boss_lives": self.__dragon_boss.get_lives(),
+            "won": not self.__dragon_boss.get_active(),
+            "over": self.__over
+        }
 
-            self.show_score()
-            self.__screen.show()
+    def get_time(self):
+        """
+        Returns the time in seconds on the game's clock
+        """
+        return self.__tick * config.DELAY
 
     def spawn_obstacles(self):
         """
-        Spawns obstacles at random
+        Spawns the obstacles the scheduler has for this tick
         """
-        if np.random.uniform() > 0.95:
-            self.spawn_firebeam()
-        if np.random.uniform() > 0.99:
-            self.spawn_magnet()
-        if np.random.uniform() > 0.9:
-            self.spawn_coins()
+        for kind, *args in self.__scheduler.pop(self.__tick):
+            if kind == "firebeam":
+                self.spawn_firebeam(*args)
+            elif kind == "magnet":
+                self.spawn_magnet(*args)
+            elif kind == "coins":
+                self.spawn_coins(*args)
 
-    def spawn_firebeam(self):
+    def spawn_firebeam(self, y, orientation):
         """
         Spawns a firebeam
         """
-        self.__objects["beams"].append(FireBeam( \
-            np.array([config.WIDTH, util.randint(0, config.MAX_HEIGHT - 6)], \
-                dtype='float64')))
+        self.__objects["beams"].spawn(np.array([config.WIDTH, y], dtype='float64'),
+                                      FireBeam.VELOCITY, sprites.firebeam(orientation))
 
-    def spawn_magnet(self):
+    def spawn_magnet(self, y):
         """
         Spawns a magnet
         """
-        self.__objects["magnets"].append(Magnet( \
-            np.array([config.WIDTH, config.MAX_HEIGHT - 3 \
-                        if np.random.uniform() > 0.5 else 0], \
-                    dtype='float64'), \
-            self))
+        self.__objects["magnets"].add(pools.acquire(Magnet, \
+            np.array([config.WIDTH, y], dtype='float64'), self))
 
-    def spawn_coins(self):
+    def spawn_coins(self, y, width):
         """
-        Spawns coins
+        Spawns a block of coins, 3 rows high
         """
-        self.__objects["coins"] += Coins( \
-            np.array([config.WIDTH, \
-                util.randint(0, config.MAX_HEIGHT - 4)], dtype='float64'),
-            np.array([3, util.randint(3, 10)])).get_items()
+        coins = Coins(np.array([config.WIDTH, y], dtype='float64'), np.array([3, width]))
+
+        self.__objects["coins"].spawn(coins.get_positions(), Coin.VELOCITY, sprites.get("coin"))
 
     def manage_keys(self, _ch):
         """
@@ -206,11 +514,13 @@ class Game:
         elif _ch == config.SHIELD_CHAR and not self.__shield_recharging:
             self.__player.activate_shield()
             self.__shield_active = True
-            self.__last_shield = time.time()
+            self.__last_shield = self.get_time()
         elif _ch == config.DRAGON_CHAR:
             self.activate_dragon()
         elif _ch == config.SPEEDOOST_CHAR:
             self.activate_boost()
+        elif _ch == config.PROFILER_CHAR:
+            self.toggle_profile()
 
         self.move_player(_ch)
 
@@ -230,64 +540,96 @@ class Game:
         This function manages shooting bullets in the game
         """
         if self.__dragon_active:
-            self.__objects["player_bullet"].append(self.__dragon.shoot())
+            position = self.__dragon.shoot()
         else:
-            self.__objects["player_bullet"].append(self.__player.shoot())
+            position = self.__player.shoot()
+
+        self.__objects["player_bullet"].spawn(position, MandalorianBullet.VELOCITY,
+                                              sprites.get("mandalorian_bullet"))
+
+    def spawn_boss_bullet(self, position):
+        """
+        Spawns a bullet shot by the boss, the boss_bullet store homes it in
+        on the Mandalorian
+        """
+        self.__objects["boss_bullet"].spawn(position, DragonBossBullet.VELOCITY,
+                                            sprites.get("boss_bullet"))
 
     def show_score(self):
         """
-        Prints the scoreboard
+        Puts the scoreboard on the screen, it is written along with the frame
         """
-        _t = time.time()
+        _t = self.get_time()
         shield_recharge_left = config.SHIELD_CHARGE - (_t - self.__last_shield_charge)
         shield_left = config.SHIELD_OUT - (_t - self.__last_shield)
 
-        print(f"🤑 {int(self.__score): >5} | 🕒 {config.TOTAL_TIME - (_t - self.__init_time): .2f}", " "*5)
-        print(f"❤️  {self.__player.get_lives(): >5}", end='')
+        # the profiler's overlay goes on the free line above the scoreboard
+        overlay = ""
+        if self.__show_profile:
+            overlay = self.__profiler.overlay()[:config.SCREEN_WIDTH]
+
+        lives = f"❤️  {self.__player.get_lives(): >5}"
         if self.__boss_mode:
-            print(f" | 😈  {self.__dragon_boss.get_lives(): >5}")
-        else:
-            print()
-        print("🛡️" ,end='  ')
+            lives += f" | 😈  {self.__dragon_boss.get_lives(): >5}"
+
         if self.__shield_recharging:
-            print("Ready in", f"{shield_recharge_left :.2f}")
+            shield = f"Ready in {shield_recharge_left :.2f}"
         elif self.__shield_active:
-            print("Time left", f"{shield_left :.2f}")
+            shield = f"Time left {shield_left :.2f}"
         else:
-            print("Ready", " "*10)
+            shield = "Ready"
+
+        self.__screen.set_hud([
+            overlay,
+            f"🤑 {int(self.__score): >5} | 🕒 {config.TOTAL_TIME - _t: .2f} "
+            f"| {self.__tick_rate: >4.1f} tps {self.__frame_rate: >4.1f} fps",
+            lives,
+            f"🛡️  {shield}"
+        ])
 
     def detect_collisions(self):
         """
-        Detects collision between various objects
+        Detects collision between various objects, applying the responses
+        of each rule before the hits of the next one are found
         """
-        for pairs in self.__colliders:
-            for hitter in self.__objects[pairs[0]]:
-                for target in self.__objects[pairs[1]]:
-                    pos_h = hitter.get_position()
-                    pos_t = target.get_position()
+        present = 0
+        for name, group in self.__objects.items():
+            if len(group):
+                present |= self.__layers[name]
 
-                    height_h, width_h = hitter.get_shape()
-                    height_t, width_t = target.get_shape()
+        for rule, hit_h, hit_t in collisions.find_hits(self.__rules, self.__objects, present):
+            hitter_type, target_type, _, score, mutual = self.__rules[rule]
+            hitters = self.__objects[hitter_type]
+            targets = self.__objects[target_type]
 
-                    minx = min(pos_h[0], pos_t[0])
-                    maxx = max(pos_h[0] + width_h, pos_t[0] + width_t)
+            if isinstance(hitters, EntityStore) and isinstance(targets, EntityStore):
+                # destroying these doesn't move them, so all hits stand
+                self.__collide(hitters, hit_h, targets, hit_t, score, mutual)
+                continue
 
-                    miny = min(pos_h[1], pos_t[1])
-                    maxy = max(pos_h[1] + height_h, pos_t[1] + height_t)
+            while len(hit_t):
+                h, t = hit_h[0], hit_t[0]
+                self.__collide(hitters, [h], targets, [t], score, mutual)
 
-                    if maxx - minx >= width_h + width_t \
-                            or maxy - miny >= height_h + height_t:
-                        continue
+                # destroying the player moves it, or swaps the Dragon for
+                # the Mandalorian, so the pairs after this one are found
+                # again from how things are now
+                hitters = self.__objects[hitter_type]
+                targets = self.__objects[target_type]
 
-                    if pairs[1] == "coins":
-                        self.__score += 10
+                hit_h, hit_t = collisions.colliding_pairs(hitters.boxes(), targets.boxes())
+                after = (hit_h > h) | ((hit_h == h) & (hit_t > t))
+                hit_h, hit_t = hit_h[after], hit_t[after]
 
-                    if pairs[1] == "beams":
-                        self.__score += 30
+    def __collide(self, hitters, hit_h, targets, hit_t, score, mutual):
+        """
+        Applies the result of hitters[hit_h[k]] colliding with targets[hit_t[k]]
+        """
+        self.__score += score * len(hit_t)
 
-                    target.destroy()
-                    if pairs[2]:
-                        hitter.destroy()
+        targets.destroy(hit_t)
+        if mutual:
+            hitters.destroy(hit_h)
 
     def activate_dragon(self):
         """
@@ -295,7 +637,7 @@ class Game:
         """
         if not self.__dragon_used:
             self.__dragon_used = True
-            self.__objects["player"] = [self.__dragon]
+            self.__objects["player"] = ObjectGroup([self.__dragon])
             self.__dragon_active = True
 
     def deactivate_dragon(self):
@@ -303,20 +645,20 @@ class Game:
         Deactivates the dragon
         """
         self.__dragon_active = False
-        self.__objects["player"] = [self.__player]
+        self.__objects["player"] = ObjectGroup([self.__player])
 
     def activate_boost(self):
         """
         Activates speed boost
         """
         config.BOOST_ACTIVE = 0.2
-        self.__last_boost = time.time()
+        self.__last_boost = self.get_time()
 
     def update_shield(self):
         """
         Manages status of shield
         """
-        _t = time.time()
+        _t = self.get_time()
 
         if self.__shield_recharging:
             if _t - self.__last_shield_charge > config.SHIELD_CHARGE:
@@ -332,7 +674,7 @@ class Game:
         """
         Manages status of speed boost
         """
-        _t = time.time()
+        _t = self.get_time()
 
         if _t - self.__last_boost > config.BOOST_OUT:
             config.BOOST_ACTIVE = 0
@@ -341,7 +683,7 @@ class Game:
         """
         Ends the game
         """
-        if time.time() - self.__init_time > config.TOTAL_TIME:
+        if self.get_time() > config.TOTAL_TIME:
             print(graphics.TIME_OUT)
         elif self.__player.get_lives() == 0:
             print(graphics.LOST_MSG)
@@ -364,7 +706,7 @@ class Game:
         """
         Adds an object of type obj_type
         """
-        self.__objects[obj_type].append(obj)
+        self.__objects[obj_type].add(obj)
 
     def add_score(self, score):
         """
@@ -372,7 +714,32 @@ class Game:
         """
         self.__score += score
 
+    def close(self):
+        """
+        Stops the threads and processes the game runs on
+        """
+        self.__scheduler.close()
+        self.__screen.close()
+
+        if self.__spectators is not None:
+            self.__spectators.close()
+
+        if self.__cast is not None:
+            self.__cast.close()
+
     def __del__(self):
+        if not self.__ready:
+            # the constructor failed, before the terminal was set up
+            self.close()
+            return
+
+        self.__scheduler.close()
+
+        if self.__headless:
+            return
+
+        self.__screen.close()
+
         self.end_game()
         print(col.Style.RESET_ALL)
         print(graphics.BYE)
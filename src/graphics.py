@@ -78,6 +78,10 @@ _\/_
  /\
 """
 
+COIN = r"""
+$
+"""
+
 MAGNET = r"""
  ______
 |..__..|
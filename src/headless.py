@@ -0,0 +1,54 @@
+"""
+This file runs the game without a terminal
+
+Nothing is drawn and there are no sleeps, ticks run as fast as the CPU
+allows, with the keys coming from an input script.
+"""
+
+import time
+
+from game import Game
+import config
+import util
+
+
+def run(script=None, ticks=None, size=None, seed=None, profiler=None):
+    """
+    Plays a game headless
+
+    Args:
+        script (dict)           : tick -> keys pressed during that tick
+        ticks (int)             : Stop after this many ticks, by default
+                                  the game runs till it is over
+        size (rows, columns)    : Size of the (imaginary) terminal
+        seed (int)              : Seed of the game, random if not given
+        profiler (Profiler)     : Times the phases of every tick
+
+    Returns:
+        dict : The game's stats (see Game.get_stats) + the wall clock time
+    """
+    if size is not None:
+        config.set_screen_size(*size)
+
+    if ticks is None:
+        ticks = int(config.TOTAL_TIME / config.DELAY) + 1
+
+    game = Game(headless=True, seed=seed, profiler=profiler)
+    kb_inp = util.ScriptedInput(script or {}, game.get_tick)
+
+    _t = time.perf_counter()
+
+    for _ in range(ticks):
+        if game.get_over() or game.tick(kb_inp):
+            break
+
+        # nothing is rendered, so every tick is a frame of its own
+        if profiler is not None:
+            profiler.end_frame(game.get_objects())
+
+    stats = game.get_stats()
+    stats["wall_time"] = time.perf_counter() - _t
+
+    game.close()
+
+    return stats
@@ -2,14 +2,127 @@
 This file contains code which runs / manages everything else
 """
 
+import sys
+import argparse
 import warnings
 import colorama as col
 
 from game import Game
+from profiler import Profiler, WINDOW
+import headless
+import replay
+import pools
+import config
+import util
 
 warnings.filterwarnings('ignore')
 
+
+def parse_args():
+    """
+    Parses the command line
+    """
+    parser = argparse.ArgumentParser(description="ASCII Jetpack Joyride")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a terminal, as fast as possible")
+    parser.add_argument("--script", help="input script for headless mode")
+    parser.add_argument("--ticks", type=int, help="stop after this many ticks")
+    parser.add_argument("--size", help="terminal size for headless mode, ROWSxCOLUMNS")
+    parser.add_argument("--seed", type=int, help="seed for the game's randomness")
+    parser.add_argument("--record", help="record the game's seed and keys to this file")
+    parser.add_argument("--replay", help="replay a recorded game, headless or on screen")
+    parser.add_argument("--speed", type=float, default=1.,
+                        help="how many times faster than real time to replay")
+    parser.add_argument("--profile", action="store_true",
+                        help="show how long each phase of a frame takes")
+    parser.add_argument("--trace", help="write a Chrome trace of the frames to this file")
+    parser.add_argument("--render-process", action="store_true",
+                        help="encode and write frames in a separate process")
+    parser.add_argument("--spectate", type=int, metavar="PORT",
+                        help="stream the game to spectators on this local port")
+    parser.add_argument("--cast", help="record what is shown to this asciicast file "
+                                       "(.cast, .cast.gz or .cast.xz)")
+
+    args = parser.parse_args()
+
+    for name in ("script", "size"):
+        if getattr(args, name) and not args.headless:
+            parser.error(f"--{name} is only used with --headless")
+        if getattr(args, name) and args.replay:
+            parser.error(f"--{name} comes from the recording with --replay")
+
+    if args.record and (args.replay or args.headless):
+        parser.error("--record only records games played on the terminal, "
+                     "not with --replay or --headless")
+
+    if args.cast and args.render_process:
+        parser.error("--cast needs the frames in this process, not with --render-process")
+
+    return parser, args
+
+
+def make_game(parser, args, seed, profiler):
+    """
+    Builds the game shown on the terminal, a port or file it can't use is
+    reported like any other bad argument
+    """
+    try:
+        return Game(seed=seed, profiler=profiler, render_process=args.render_process,
+                    spectate=args.spectate, cast=args.cast)
+    except OSError as err:
+        # only opening the recording fails with a file name
+        if err.filename is not None:
+            parser.error(f"--cast: can't write {err.filename}: {err.strerror}")
+
+        parser.error(f"--spectate: {err.strerror}")
+
+
 if __name__ == "__main__":
-    col.init()
+    parser, args = parse_args()
+
+    script = util.load_script(args.script) if args.script else None
+    size = tuple(int(x) for x in args.size.split("x")) if args.size else None
+    seed = args.seed
+
+    profiler = Profiler(trace=bool(args.trace)) if args.profile or args.trace else None
+
+    if args.replay:
+        header, script = replay.load(args.replay)
+        size, seed = tuple(header["size"]), header["seed"]
+
+    if args.headless:
+        stats = headless.run(script, args.ticks, size, seed, profiler)
+
+        print(*(f"{key}: {value}" for key, value in stats.items()), sep="\n")
+        print(f"ticks/s: {stats['ticks'] / stats['wall_time']:.0f}")
+
+        if profiler is not None:
+            print(f"profile (ms, last {WINDOW} ticks): {profiler.overlay()}")
+
+        for name, pool in pools.stats().items():
+            print(f"pool {name}: {pool['created']} made, {pool['reused']} reused, "
+                  f"{pool['high_water']} at most in use")
+    elif args.replay:
+        col.init()
+
+        config.set_screen_size(*size)
+
+        game = make_game(parser, args, seed, profiler)
+        game.start(util.ScriptedInput(script, game.get_tick), args.speed, follow_resize=False)
+    else:
+        if not config.fits(*config.terminal_size()):
+            sys.exit(config.too_small_message(*config.terminal_size()))
+
+        col.init()
+
+        game = make_game(parser, args, seed, profiler)
+
+        if args.record:
+            recorder = replay.Recorder(args.record, util.KBHit(), game)
+            game.start(recorder, follow_resize=False)
+            recorder.close()
+        else:
+            game.start()
 
-    Game().start()
+    if args.trace:
+        profiler.dump(args.trace)
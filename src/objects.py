@@ -2,6 +2,7 @@
 This file will contain the generic object file
 """
 
+import math
 import numpy as np
 import colorama as col
 
@@ -12,11 +13,21 @@ class GameObject:
     """
     All objects should inherit from this class
     Has basic stuff like motion, gravity, color, static motion, etc
+
+    Position, velocity and acceleration are kept as plain floats, which are
+    much cheaper than NumPy calls on tiny arrays. The getters still return
+    [x, y] arrays, so that callers can do vector math with them.
     """
 
+    __slots__ = ("__rep", "__x", "__y", "__vx", "__vy", "__ax", "__ay",
+                 "__gravity", "__height", "__width", "__color", "__active")
+
+    # does the speed boost move this object faster?
+    BOOSTED = True
+
     def __init__(self, rep=np.array([[" "]]), position=np.array([0., 0.]),
                  velocity=np.array([0., 0.]), accel=np.array([0., 0.]),
-                 gravity=0, color=np.array([[("", "")]])):
+                 gravity=0, color=np.zeros((1, 1), dtype=np.uint8)):
         """
         Constructor for all objects
 
@@ -26,12 +37,12 @@ class GameObject:
             velocity ([vx, vy]) : Speed with which the object moves
             accel ([fx, fy])    : accel in both dir
             gravity (float)     : Gravitational accel on that object
-            color (2D np.array) : Color of each character
+            color (2D np.array) : Palette index of each character's color
         """
         self.__rep = rep
-        self.__position = position
-        self.__velocity = velocity
-        self.__accel = accel
+        self.__x, self.__y = float(position[0]), float(position[1])
+        self.__vx, self.__vy = float(velocity[0]), float(velocity[1])
+        self.__ax, self.__ay = float(accel[0]), float(accel[1])
         self.__gravity = gravity
         self.__height, self.__width = self.__rep.shape
         self.__color = color
@@ -44,37 +55,70 @@ class GameObject:
         Returns:
             bool: whether to destroy this object or not
         """
-        is_on_ground = self.__position[1] + self.__height >= \
-                        config.MAX_HEIGHT
+        is_on_ground = self.__y + self.__height >= config.MAX_HEIGHT
 
-        if np.isinf(self.__velocity[0]):
-            self.__velocity[0] = 0
+        if math.isinf(self.__vx):
+            self.__vx = 0.
 
         # simulate drag
-        self.__accel[0] = ((-1) ** int(self.__velocity[0] >= 0)) *\
-                config.DRAG_CONST * (self.__velocity[0] ** 2)
-        self.__accel[1] = self.__gravity * int(not is_on_ground)
+        drag = config.DRAG_CONST * self.__vx * self.__vx
+        self.__ax = -drag if self.__vx >= 0 else drag
+        self.__ay = self.__gravity * int(not is_on_ground)
 
-        if self.__class__.__name__ != "Mandalorian":
-            self.__velocity[0] += np.sign(self.__velocity[0]) * config.BOOST_ACTIVE
+        if self.BOOSTED:
+            self.__vx += _sign(self.__vx) * config.BOOST_ACTIVE
 
-        self.__velocity += self.__accel
+        self.__vx += self.__ax
+        self.__vy += self.__ay
 
         # if is colliding with roof
-        if self.__position[1] == 0:
-            self.__velocity[1] = max(0, self.__velocity[1])
+        if self.__y == 0:
+            self.__vy = max(0., self.__vy)
 
         if is_on_ground:
-            self.__velocity[1] = min(0, self.__velocity[1])
+            self.__vy = min(0., self.__vy)
+
+        self.__x = float(round(min(max(self.__x + self.__vx, 0), config.WIDTH - self.__width)))
+        self.__y = float(round(min(max(self.__y + self.__vy, 0),
+                                   config.MAX_HEIGHT - self.__height)))
+
+        return self.__active and self.__x + self.__width >= 0
+
+    def drift(self):
+        """
+        Moves the object in a straight line, speeding up with the boost
+
+        Returns:
+            bool : Is the object still active and on the screen?
+        """
+        self.__vx += _sign(self.__vx) * config.BOOST_ACTIVE
+
+        self.__x += self.__vx
+        self.__y += self.__vy
+
+        return self.__active and self.__x + self.__width >= 0
 
-        np.clip(self.__velocity, -5, 5)
+    def reset(self, position, velocity, rep=None, color=None):
+        """
+        Makes the object as good as new
 
-        tmp_pos = self.__position + self.__velocity
+        Args:
+            position ([x, y])   : New position of the object
+            velocity ([vx, vy]) : New velocity of the object
+            rep (2D np.array)   : New look of the object, if it changes
+            color (2D np.array) : New colors of the object, if they change
+        """
+        self.__x, self.__y = float(position[0]), float(position[1])
+        self.__vx, self.__vy = float(velocity[0]), float(velocity[1])
+        self.__ax = self.__ay = 0.
 
-        self.__position[0] = int(np.round(np.clip(tmp_pos[0], 0, config.WIDTH - self.__width)))
-        self.__position[1] = int(np.round(np.clip(tmp_pos[1], 0, config.MAX_HEIGHT - self.__height)))
+        if rep is not None:
+            self.__rep = rep
+            self.__height, self.__width = rep.shape
+        if color is not None:
+            self.__color = color
 
-        return self.__active and self.__position[0] + self.__width >= 0
+        self.__active = True
 
     def get_rep(self, frame=0):
         """
@@ -122,19 +166,32 @@ class GameObject:
         """
         Returns the position
         """
-        return self.__position
+        return np.array([self.__x, self.__y])
+
+    def get_x(self):
+        """
+        Returns the x coordinate of the position
+        """
+        return self.__x
+
+    def get_y(self):
+        """
+        Returns the y coordinate of the position
+        """
+        return self.__y
 
     def set_position(self, pos):
         """
         Sets the position
         """
-        self.__position = pos
+        self.__x, self.__y = float(pos[0]), float(pos[1])
 
     def add_position(self, pos):
         """
         Adds to the position
         """
-        self.__position += pos
+        self.__x += float(pos[0])
+        self.__y += float(pos[1])
 
     def get_shape(self):
         """
@@ -146,19 +203,20 @@ class GameObject:
         """
         Returns the velocity
         """
-        return self.__velocity
+        return np.array([self.__vx, self.__vy])
 
     def set_velocity(self, vel):
         """
         Sets the velocity
         """
-        self.__velocity = np.array(vel)
+        self.__vx, self.__vy = float(vel[0]), float(vel[1])
 
     def add_velocity(self, vel):
         """
         Adds something to the velocity
         """
-        self.__velocity += np.array(vel)
+        self.__vx += float(vel[0])
+        self.__vy += float(vel[1])
 
     def get_active(self):
         """
@@ -172,12 +230,25 @@ class GameObject:
         """
         self.__active = active
 
-    def __del__(self):
-        """
-        For debugging
-        """
-        if config.DEBUG_ALL:
-            print("Destroyed", self.__class__.__name__)
+
+
+def _sign(value):
+    """
+    np.sign for a float, without the overhead of a NumPy call
+    """
+    return float((value > 0) - (value < 0))
+
+
+def _report_destroyed(obj):
+    """
+    For debugging
+    """
+    print("Destroyed", obj.__class__.__name__)
+
+
+# a __del__ makes every object slower to collect, so only add it when needed
+if config.DEBUG_ALL:
+    GameObject.__del__ = _report_destroyed
 
 
 class Ground(GameObject):
@@ -185,16 +256,35 @@ class Ground(GameObject):
     This is the class for Ground
     """
 
+    __slots__ = ()
+
     def __init__(self):
         """
         Constructor for Ground
         """
-        rep = np.full((config.GROUND_HEIGHT, config.WIDTH), ".")
-        color = util.tup_to_array(rep.shape, (col.Back.GREEN, col.Fore.BLACK))
+        rep, color = self.build()
         pos = np.array([0, config.MAX_HEIGHT])
 
         super().__init__(rep=rep, position=pos, color=color)
 
+    @staticmethod
+    def build():
+        """
+        Returns the (rep, color) of ground as wide as the screen
+        """
+        rep = np.full((config.GROUND_HEIGHT, config.WIDTH), ".")
+        color = util.tup_to_array(rep.shape, (col.Back.GREEN, col.Fore.BLACK))
+
+        return rep, color
+
+    def resize(self):
+        """
+        Makes the ground fit the screen after it was resized
+        """
+        rep, color = self.build()
+
+        self.reset([0, config.MAX_HEIGHT], [0, 0], rep, color)
+
     def update(self):
         """
         Updates the ground
@@ -3,20 +3,22 @@ This file contains all obstacles
 """
 
 import numpy as np
-import colorama as col
 
 from objects import GameObject
 import config
 import util
-import graphics
+import sprites
+import pools
 
 class Obstacle(GameObject):
     """
     This class will be the parent for all obstacles
     """
 
+    __slots__ = ()
+
     def __init__(self, rep=np.array([[" "]]), position=np.array([0., 0.]),
-                 velocity=np.array([0., 0.]), color=np.array([[""]])):
+                 velocity=np.array([0., 0.]), color=np.zeros((1, 1), dtype=np.uint8)):
         """
         Constructor for obstacle
 
@@ -24,7 +26,7 @@ class Obstacle(GameObject):
             rep (2D np.array)   : How the obstacle looks
             position [px, py]   : Initial position of the obstacle
             velocity [vx, vy]   : Velocity of the object
-            color (2D np.array) : Color of each pixel of the object
+            color (2D np.array) : Palette index of each pixel's color
         """
         super().__init__(rep, position, velocity, np.array([0., 0.]), 0., color)
 
@@ -35,15 +37,7 @@ class Obstacle(GameObject):
         Returns:
             bool : Should the object be rendered in the next frame?
         """
-        vel = self.get_velocity()
-        self.add_velocity(np.array([np.sign(vel[0]) * config.BOOST_ACTIVE, 0.]))
-
-        self.add_position(self.get_velocity())
-
-        pos = self.get_position()
-        _, _w = self.get_shape()
-
-        return self.get_active() and pos[0] + _w >= 0
+        return self.drift()
 
 
 class FireBeam(Obstacle):
@@ -51,21 +45,32 @@ class FireBeam(Obstacle):
     Manages FireBeam
     """
 
-    def __init__(self, position, orientation=None):
+    __slots__ = ()
+
+    VELOCITY = np.array([-2., 0.])
+
+    def __init__(self, position, orientation=None, rng=None):
         """
         Constructor for FireBeam
 
         Args:
             position [px, py] : Initial position of the FireBeam
             orientation (int) : 0 -> config.FIREBEAM_MAX, type of FireBeam
+            rng (Generator)   : Used to pick a random orientation
         """
-        if orientation is None or orientation < 0 or orientation > config.FIREBEAM_MAX:
-            orientation = util.randint(0, config.FIREBEAM_MAX - 1)
+        rep, color = sprites.firebeam(self.pick_orientation(orientation, rng))
 
-        rep = util.str_to_array(graphics.FIREBEAM[orientation])
-        color = util.tup_to_array(rep.shape, (col.Back.RED, col.Fore.YELLOW))
+        super().__init__(rep, position, FireBeam.VELOCITY.copy(), color)
+
+    @staticmethod
+    def pick_orientation(orientation, rng=None):
+        """
+        Returns orientation if it is valid, a random one otherwise
+        """
+        if orientation is None or orientation < 0 or orientation > config.FIREBEAM_MAX:
+            orientation = util.randint(0, config.FIREBEAM_MAX - 1, rng)
 
-        super().__init__(rep, position, np.array([-2., 0.]), util.mask(rep, color))
+        return orientation
 
 
 class Magnet(Obstacle):
@@ -73,35 +78,42 @@ class Magnet(Obstacle):
     Manages the magnet obstacle
     """
 
+    __slots__ = ("fields",)
+
     def __init__(self, position, game):
         """
         Constructor for Magnet
 
         Args:
             position [px, py] : Initial position of the Magnet
-            game (Game)       : The game object
+            game (Game)       : The game object, only its force fields are
+                                kept so that a pooled magnet doesn't keep
+                                the game alive
         """
-
-        self.game = game
-        rep = util.str_to_array(graphics.MAGNET)
-        color = util.tup_to_array(rep.shape, (col.Back.MAGENTA, col.Fore.RED))
+        self.fields = game.get_fields()
+        rep, color = sprites.get("magnet")
 
         super().__init__(rep, position, np.array([-2., 0.]), color=color)
 
-    def update(self):
+    def reset(self, position, game):
         """
-        Update obstacle's position and attract Mandalorian
+        Reuses the Magnet, with the same arguments as the constructor
         """
-        vel = self.get_velocity()
-        self.add_velocity(np.array([np.sign(vel[0]) * config.BOOST_ACTIVE, 0.]))
+        self.fields = game.get_fields()
 
-        self.add_position(self.get_velocity())
+        super().reset(position, [-2., 0.])
+
+    def update(self):
+        """
+        Update obstacle's position and attract Mandalorian, or whatever
+        config.MAGNET_TARGETS says
+        """
+        active = self.drift()
 
-        diff = np.linalg.norm(self.get_position() - self.game.get_player().get_position()) + 1
+        self.fields.emit(self.get_position(), config.MAGNET_STRENGTH,
+                         config.MAGNET_TARGETS)
 
-        self.game.get_player().add_velocity(0.3 * (self.get_position() - self.game.get_player().get_position()) / diff)
+        return active
 
-        pos = self.get_position()
-        _, _w = self.get_shape()
 
-        return self.get_active() and pos[0] + _w >= 0
+pools.register(Magnet)
@@ -0,0 +1,59 @@
+"""
+This file contains the color palette
+
+Every (bg, fg) pair used in the game is registered once and gets a small
+integer index. Color arrays only store these indices (np.uint8), which
+are mapped back to escape codes when the frame is written out.
+"""
+
+import numpy as np
+
+import config
+
+# the palette index has to fit in a np.uint8
+MAX_COLORS = 256
+
+_PAIRS = []
+_INDEX = {}
+
+# escape code for each index, so that ESCAPES[color_array] works in bulk
+ESCAPES = np.empty(0, dtype=object)
+
+
+def register(color):
+    """
+    Returns the index of a (bg, fg) pair, adding it to the palette if needed
+
+    Args:
+        color (str, str) : (bg, fg) escape codes
+
+    Returns:
+        int : Index of the pair in the palette
+    """
+    global ESCAPES
+
+    color = tuple(color)
+
+    if color not in _INDEX:
+        if len(_PAIRS) == MAX_COLORS:
+            raise ValueError(f"palette is full, can't add {color!r}")
+
+        _INDEX[color] = len(_PAIRS)
+        _PAIRS.append(color)
+
+        escapes = np.empty(len(_PAIRS), dtype=object)
+        escapes[:] = ["".join(pair) for pair in _PAIRS]
+        ESCAPES = escapes
+
+    return _INDEX[color]
+
+
+def get(index):
+    """
+    Returns the (bg, fg) pair stored at index
+    """
+    return _PAIRS[index]
+
+
+# sky, index 0 so that np.zeros gives a blank color array
+DEFAULT = register((config.BG_COL, config.FG_COL))
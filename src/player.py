@@ -10,13 +10,15 @@ from objects import GameObject
 import graphics
 import config
 import util
-from bullets import MandalorianBullet, DragonBossBullet
+import sprites
 
 class Player(GameObject):
     """
     This is the base class for all "Players"
     """
 
+    __slots__ = ("game", "__lives")
+
     def __init__(self, rep, position, gravity, color, lives, game):
         """
         Constructor for Player
@@ -70,6 +72,11 @@ class Mandalorian(Player):
     This class is for managing the Mandalorian
     """
 
+    __slots__ = ("init_pos", "__controls", "shield_active")
+
+    # the boost speeds up the world around the Mandalorian, not itself
+    BOOSTED = False
+
     def __init__(self, game):
         """
         Constructor for the Mandalorian
@@ -105,8 +112,11 @@ class Mandalorian(Player):
     def shoot(self):
         """
         Shoots a bullet
+
+        Returns:
+            [px, py] : Where the bullet starts
         """
-        return MandalorianBullet(self.get_position() + np.array([2., 0.]))
+        return self.get_position() + np.array([2., 0.])
 
     def destroy(self):
         """
@@ -149,6 +159,8 @@ class Dragon(Player):
     This class is for managing our Dragon
     """
 
+    __slots__ = ("width", "height", "controls", "head", "__frames")
+
     def __init__(self, game):
         """
         Constructor for the dragon
@@ -163,6 +175,8 @@ class Dragon(Player):
 
         super().__init__(rep, np.array([0., config.MAX_HEIGHT - self.height]), 0.3, color, 1, game)
 
+        self.__frames = sprites.FrameCache(self.build_frame, config.DRAGON_PHASES)
+
 
     def move(self, key):
         """
@@ -183,57 +197,61 @@ class Dragon(Player):
         """
         self.game.deactivate_dragon()
 
-    def get_rep(self, phase_offset=0):
+    def update(self):
         """
-        Returns the live representation of dragon
+        Moves the dragon and keeps track of where its head is
         """
-        rep = np.full((self.height, self.width), " ")
-        color = util.tup_to_array(rep.shape, (col.Back.BLACK, col.Fore.GREEN))
-
-        dragon_head = util.str_to_array(graphics.DRAGON_HEAD)
-        head_h, head_w = dragon_head.shape
+        active = super().update()
 
-        # phase_offset = 4 * (phase_offset // 4)
+        _, _, beg_h = self.__frames.get(self.game.get_tick())
+        self.head = self.get_position() + beg_h
 
-        _h, _w = self.get_shape()
+        return active
 
-        body_width = _w - head_w
+    def get_rep(self, phase_offset=0):
+        """
+        Returns the live representation of dragon
+        """
+        rep, color, _ = self.__frames.get(phase_offset)
 
-        _y = np.sin(np.linspace(-np.pi, np.pi, body_width) + phase_offset)
-        _y *= (_h / 2)
-        _y += (_h / 2)
+        return rep, color
 
-        _y = _y.astype(int)
+    def build_frame(self, phase):
+        """
+        Draws the dragon with its body at the given phase
 
-        for i in range(body_width):
-            rep[_y[i]][i] = "~"
+        Returns:
+            (rep, color, beg_h) : read-only arrays + the row of the head
+        """
+        dragon_head, _ = sprites.get("dragon_head")
+        head_h, head_w = dragon_head.shape
 
-            if _y[i] > self.height - 2:
-                rep[_y[i] - 2][i] = "~"
-            else:
-                rep[_y[i] + 1][i] = "~"
+        _h, _w = self.get_shape()
 
-            if _y[i] == 0:
-                rep[2][i] = "~"
-            else:
-                rep[_y[i] - 1][i] = "~"
+        rep, _y = sprites.sine_wave(_h, _w - head_w, phase)
+        rep = np.hstack((rep, np.full((_h, head_w), " ")))
 
         beg_h = int(min(_y[-1], self.height - head_h))
 
         rep[beg_h:beg_h + head_h, -head_w:] = dragon_head
 
-        self.head = self.get_position() + beg_h
-
+        color = util.tup_to_array(rep.shape, (col.Back.BLACK, col.Fore.GREEN))
         color = util.mask(rep, color)
 
-        return rep, color
+        rep.setflags(write=False)
+        color.setflags(write=False)
+
+        return rep, color, beg_h
 
     def shoot(self):
         """
         Shoots the bullet for Dragon
+
+        Returns:
+            [px, py] : Where the bullet starts
         """
         _, _w = self.get_shape()
-        return MandalorianBullet(self.head + np.array([_w, 0.]))
+        return self.head + np.array([_w, 0.])
 
 
 class DragonBoss(Player):
@@ -241,6 +259,8 @@ class DragonBoss(Player):
     This class is for managing the Dragon Boss enemy
     """
 
+    __slots__ = ()
+
     def __init__(self, game):
         """
         Constructor for the Dragon
@@ -259,9 +279,8 @@ class DragonBoss(Player):
 
         _h, _ = self.get_shape()
 
-        if np.random.normal() > 0.99:
-            self.game.add_object("boss_bullet", \
-                DragonBossBullet(self.get_position() + np.array([-2., 3.]), self.game.get_player()))
+        if self.game.get_scheduler().normal() > 0.99:
+            self.game.spawn_boss_bullet(self.get_position() + np.array([-2., 3.]))
 
         pos = self.get_position()
         self.set_position([pos[0], min(player_y, config.MAX_HEIGHT - _h)])
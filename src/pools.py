@@ -0,0 +1,128 @@
+"""
+This file contains the object pools
+
+Short lived objects like magnets are taken from the pool of their class
+with acquire() and given back with release() once the game is done with
+them, instead of making a new object every time. A reused object is
+reset() in place with the arguments its constructor would take. Objects
+which point back into the game can drop those references in a detach(),
+which is called when they are released, so that a free object doesn't
+keep a finished game alive.
+
+Only classes which have been register()ed are pooled, releasing anything
+else does nothing. Bullets, beams and coins aren't, they are spawned
+straight into the rows of their entity stores.
+"""
+
+import config
+
+_POOLS = {}
+
+
+class ObjectPool:
+    """
+    The free objects of one class, with some stats about their use
+    """
+
+    def __init__(self, cls, cap):
+        """
+        Constructor for ObjectPool
+
+        Args:
+            cls (type) : Class of the objects, it needs a reset() taking
+                         the same arguments as its constructor
+            cap (int)  : Most free objects kept, the rest are left to the GC
+        """
+        self.__cls = cls
+        self.__cap = cap
+        self.__free = []
+
+        self.__created = 0
+        self.__reused = 0
+        self.__in_use = 0
+        self.__high_water = 0
+
+    def __len__(self):
+        return len(self.__free)
+
+    def acquire(self, *args, **kwargs):
+        """
+        Returns a free object reset with the given arguments, or a new one
+        """
+        if self.__free:
+            obj = self.__free.pop()
+            obj.reset(*args, **kwargs)
+            self.__reused += 1
+        else:
+            obj = self.__cls(*args, **kwargs)
+            self.__created += 1
+
+        self.__in_use += 1
+        self.__high_water = max(self.__high_water, self.__in_use)
+
+        return obj
+
+    def release(self, obj):
+        """
+        Gives an object back to the pool, it must not be used after this
+        """
+        self.__in_use = max(0, self.__in_use - 1)
+
+        if len(self.__free) < self.__cap:
+            obj.set_active(False)
+            if hasattr(obj, "detach"):
+                obj.detach()
+
+            self.__free.append(obj)
+
+    def get_stats(self):
+        """
+        Returns how the pool has been used so far
+        """
+        return {
+            "created": self.__created,
+            "reused": self.__reused,
+            "in_use": self.__in_use,
+            "high_water": self.__high_water,
+            "free": len(self.__free),
+            "cap": self.__cap
+        }
+
+
+def register(cls, cap=None):
+    """
+    Makes a pool for the objects of cls
+
+    Args:
+        cls (type) : Class to pool
+        cap (int)  : Most free objects kept, config.POOL_MAX by default
+    """
+    _POOLS[cls] = ObjectPool(cls, config.POOL_MAX if cap is None else cap)
+
+
+def acquire(cls, *args, **kwargs):
+    """
+    Returns an object of class cls made with the given arguments, reusing
+    a free one if the class is pooled
+    """
+    pool = _POOLS.get(cls)
+    if pool is None:
+        return cls(*args, **kwargs)
+
+    return pool.acquire(*args, **kwargs)
+
+
+def release(obj):
+    """
+    Gives obj back to the pool of its class, if there is one
+    """
+    pool = _POOLS.get(type(obj))
+    if pool is not None:
+        pool.release(obj)
+
+
+def stats():
+    """
+    Returns the stats of every pool, by class name
+    """
+    return {cls.__name__: pool.get_stats() for cls, pool in _POOLS.items()}
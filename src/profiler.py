@@ -0,0 +1,152 @@
+"""
+This file contains the frame profiler
+
+The game loop calls lap(name) at the end of every phase, the time since
+the previous lap goes to that phase. Frames are closed by end_frame(),
+which also counts the objects in the game. The profiler can show a summary
+of the last few frames and write a Chrome / Perfetto trace of the run.
+
+NullProfiler does nothing, so a game which isn't profiled only pays for a
+few empty method calls per tick.
+"""
+
+import json
+import time
+from collections import deque
+
+# frames averaged over for the overlay
+WINDOW = 30
+
+# phases in the order they happen in a frame
+PHASES = ("idle", "input", "spawn", "collisions", "update", "draw", "hud", "write")
+
+# short names for the overlay
+LABELS = {
+    "idle": "idle",
+    "input": "in",
+    "spawn": "spawn",
+    "collisions": "coll",
+    "update": "upd",
+    "draw": "draw",
+    "hud": "hud",
+    "write": "out"
+}
+
+
+class Profiler:
+    """
+    Times the phases of every frame and counts objects
+    """
+
+    def __init__(self, trace=False):
+        """
+        Constructor for Profiler
+
+        Args:
+            trace (bool) : Keep every lap, so that dump() can write a trace
+        """
+        self.__start = self.__last = time.perf_counter()
+
+        self.__frame = dict.fromkeys(PHASES, 0.)
+        self.__frames = deque(maxlen=WINDOW)
+        self.__counts = {}
+
+        # (name, start, duration) of every lap, and (time, counts) of
+        # every frame, in seconds since the profiler was made
+        self.__trace = trace
+        self.__laps = []
+        self.__samples = []
+
+    def lap(self, name):
+        """
+        Ends the phase name, which started at the previous lap
+        """
+        _t = time.perf_counter()
+
+        self.__frame[name] = self.__frame.get(name, 0.) + _t - self.__last
+        if self.__trace:
+            self.__laps.append((name, self.__last - self.__start, _t - self.__last))
+
+        self.__last = _t
+
+    def end_frame(self, objects):
+        """
+        Ends the frame, counting the objects in every group
+
+        Args:
+            objects (dict) : Groups of objects in the game, by type
+        """
+        self.__counts = {name: len(group) for name, group in objects.items()}
+
+        self.__frames.append(self.__frame)
+        self.__frame = dict.fromkeys(PHASES, 0.)
+
+        if self.__trace:
+            self.__samples.append((self.__last - self.__start, self.__counts))
+
+    def get_averages(self):
+        """
+        Returns the average time in ms of each phase over the last frames
+        """
+        if not self.__frames:
+            return dict.fromkeys(PHASES, 0.)
+
+        return {name: 1000 * sum(frame.get(name, 0.) for frame in self.__frames)
+                      / len(self.__frames)
+                for name in self.__frames[-1]}
+
+    def get_counts(self):
+        """
+        Returns the number of objects in each group at the last frame
+        """
+        return self.__counts
+
+    def overlay(self):
+        """
+        Returns a one line summary of the last frames, for the scoreboard
+        """
+        averages = self.get_averages()
+        busy = sum(ms for name, ms in averages.items() if name != "idle")
+
+        return " ".join([f"{LABELS.get(name, name)} {ms:.1f}" for name, ms in averages.items()]
+                        + [f"= {busy:.1f} ms |"]
+                        + [f"{name} {count}" for name, count in self.__counts.items() if count])
+
+    def dump(self, path):
+        """
+        Writes the trace in the Chrome trace event format, which can be
+        opened in chrome://tracing or ui.perfetto.dev
+
+        Args:
+            path (str) : File to write to
+        """
+        events = [{"name": "process_name", "ph": "M", "pid": 0,
+                   "args": {"name": "jetpack joyride"}}]
+
+        events += [{"name": name, "cat": "frame", "ph": "X", "pid": 0, "tid": 0,
+                    "ts": 1e6 * start, "dur": 1e6 * duration}
+                   for name, start, duration in self.__laps]
+
+        events += [{"name": "objects", "ph": "C", "pid": 0, "ts": 1e6 * _t, "args": counts}
+                   for _t, counts in self.__samples]
+
+        with open(path, "w") as _f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, _f)
+
+
+class NullProfiler(Profiler):
+    """
+    A profiler which measures nothing
+    """
+
+    def __init__(self):
+        super().__init__()
+
+    def lap(self, name):
+        pass
+
+    def end_frame(self, objects):
+        pass
+
+    def dump(self, path):
+        pass
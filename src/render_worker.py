@@ -0,0 +1,204 @@
+"""
+This file contains the render process
+
+WorkerScreen draws into frames kept in shared memory and leaves encoding
+and writing them to another process. There are two frames: the game draws
+into one while the worker encodes the other, and show() only hands over
+the frame which was just drawn. If the worker is still busy with the
+previous frame the new one is dropped, so a slow terminal costs frames
+instead of slowing the game down.
+"""
+
+import sys
+import signal
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+from screen import Screen, FrameEncoder, write_frame
+import palette
+
+
+def frame_arrays(shm, height, width):
+    """
+    Returns the (display, color) arrays of a frame in shared memory
+    """
+    display = np.ndarray((height, width), dtype="<U1", buffer=shm.buf)
+    color = np.ndarray((height, width), dtype=np.uint8, buffer=shm.buf, offset=display.nbytes)
+
+    return display, color
+
+
+def frame_size(height, width):
+    """
+    Returns the bytes needed by a frame of the given size
+    """
+    return height * width * (np.dtype("<U1").itemsize + 1)
+
+
+def run_worker(conn, names, height, width, escapes):
+    """
+    The render process, encodes and writes every frame it is handed
+
+    Args:
+        conn (Connection)   : Where the frames are announced and acknowledged
+        names (list)        : Names of the shared memory of both frames
+        height, width (int) : Size of the frames
+        escapes (list)      : Escape code of each palette index
+    """
+    # ^C is for the game to handle
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    slots = [shared_memory.SharedMemory(name) for name in names]
+    frames = [frame_arrays(shm, height, width) for shm in slots]
+
+    encoder = FrameEncoder(height, width)
+    escapes = np.array(escapes, dtype=object)
+    display = color = None
+
+    try:
+        while True:
+            message = conn.recv()
+
+            if message[0] == "stop":
+                break
+
+            if message[0] == "invalidate":
+                encoder.invalidate()
+                continue
+
+            _, slot, hud, new_escapes = message
+            if new_escapes is not None:
+                escapes = np.array(new_escapes, dtype=object)
+
+            display, color = frames[slot]
+            write_frame(encoder.encode(display, color, escapes, hud))
+
+            conn.send(slot)
+    except (EOFError, BrokenPipeError):
+        # the game is gone
+        pass
+    finally:
+        # the arrays have to go before the memory they point into
+        del frames, display, color
+        for shm in slots:
+            shm.close()
+
+
+class WorkerScreen(Screen):
+    """
+    A screen whose frames are encoded and written by a render process
+    """
+
+    def __init__(self):
+        self.__process = None
+        self.__dropped = 0
+
+        super().__init__()
+
+    def resize(self):
+        """
+        Makes the frame fit config.WIDTH x config.HEIGHT, with a new render
+        process for frames of the new size
+        """
+        self.close()
+
+        super().resize()
+
+        size = frame_size(self.height, self.width)
+        self.__slots = [shared_memory.SharedMemory(create=True, size=size) for _ in range(2)]
+        self.__frames = [frame_arrays(shm, self.height, self.width) for shm in self.__slots]
+
+        # the game draws into the back frame, the worker reads the other one,
+        # and each of them has its own regions drawn over
+        self.__back = 0
+        self.__dirty = [None, None]
+        self.swap_buffers(*self.__frames[self.__back], None)
+        self.clear()
+
+        self.__busy = False
+        self.__palette = len(palette.ESCAPES)
+
+        self.__conn, child = mp.Pipe()
+
+        # anything still buffered would be written by the child as well
+        sys.stdout.flush()
+
+        self.__process = mp.Process(target=run_worker, daemon=True, args=(
+            child, [shm.name for shm in self.__slots], self.height, self.width,
+            palette.ESCAPES.tolist()))
+        self.__process.start()
+
+        child.close()
+
+    def invalidate(self):
+        """
+        Forgets what is on the terminal, the next frame is fully repainted
+        """
+        self.__conn.send(("invalidate",))
+
+    def show(self):
+        """
+        Hands the frame over to the render process, unless it is still busy
+        """
+        while self.__conn.poll():
+            self.__conn.recv()
+            self.__busy = False
+
+        if self.__busy:
+            self.__dropped += 1
+            return
+
+        # colors registered since the last frame
+        escapes = None
+        if len(palette.ESCAPES) != self.__palette:
+            escapes = palette.ESCAPES.tolist()
+            self.__palette = len(escapes)
+
+        self.__conn.send(("frame", self.__back, self.hud, escapes))
+        self.__busy = True
+
+        back, self.__back = self.__back, 1 - self.__back
+        self.__dirty[back] = self.swap_buffers(*self.__frames[self.__back],
+                                               self.__dirty[self.__back])
+
+    def bake(self, obj):
+        """
+        Draws an object which doesn't move or change into the static layer
+        """
+        super().bake(obj)
+
+        self.__dirty = [None, None]
+
+    def get_dropped(self):
+        """
+        Returns the number of frames dropped because the worker was busy
+        """
+        return self.__dropped
+
+    def close(self):
+        """
+        Waits for the last frame to be written and stops the render process
+        """
+        if self.__process is None:
+            return
+
+        try:
+            self.__conn.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+
+        self.__process.join(2)
+        if self.__process.is_alive():
+            self.__process.terminate()
+
+        self.__conn.close()
+        self.__process = None
+
+        # the frames live on in normal memory, in case anything draws again
+        self.swap_buffers(self.display.copy(), self.color.copy(), None)
+        self.__frames = None
+
+        for shm in self.__slots:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,86 @@
+"""
+This file records games and replays them
+
+A recording is a header line (JSON) with the seed and the terminal size,
+followed by one line per tick in which the game got keys, in the same
+format as the input scripts: the tick and the keys as a JSON string.
+Since all randomness comes from the seed and the game runs on its own
+clock, replaying the keys on the same ticks plays out the same game.
+"""
+
+import json
+
+import config
+import util
+
+# games recorded by an older version play out differently, e.g. version 2
+# draws its randomness from the spawn scheduler
+VERSION = 2
+
+
+class Recorder:
+    """
+    Wraps an input (e.g. KBHit) and writes every key the game reads to a file
+    """
+
+    def __init__(self, path, kb_inp, game):
+        """
+        Constructor for Recorder
+
+        Args:
+            path (str)     : Where the recording is written
+            kb_inp         : Input to record (KBHit, ScriptedInput, ..)
+            game (Game)    : The game being recorded
+        """
+        self.__kb_inp = kb_inp
+        self.__game = game
+
+        # line buffered, so that a crash still leaves a usable recording
+        self.__file = open(path, "w", buffering=1)
+        self.__file.write(json.dumps({
+            "version": VERSION,
+            "seed": game.get_seed(),
+            "size": [config.SCREEN_HEIGHT, config.SCREEN_WIDTH]
+        }) + "\n")
+
+    def keys(self):
+        """
+        Returns the keys pressed since the last call, writing them down
+        along with the tick
+        """
+        keys = self.__kb_inp.keys()
+        if keys:
+            self.__file.write(f"{self.__game.get_tick()} {json.dumps(''.join(keys))}\n")
+
+        return keys
+
+    def wait_until(self, deadline):
+        """
+        Waits for the next tick
+        """
+        self.__kb_inp.wait_until(deadline)
+
+    def close(self):
+        """
+        Finishes the recording
+        """
+        self.__file.close()
+
+
+def load(path):
+    """
+    Reads a recording
+
+    Args:
+        path (str) : Path of the recording
+
+    Returns:
+        (dict, dict) : The header, and the keys as a tick -> keys script
+    """
+    with open(path) as _f:
+        header = json.loads(_f.readline())
+
+    if header.get("version") != VERSION:
+        raise ValueError(f"{path}: unsupported recording version {header.get('version')}")
+
+    return header, util.load_script(path)
@@ -3,60 +3,376 @@ This file is supposed to contain all the logic related to
 displaying stuff on screen
 """
 
+import io
+import os
 import sys
 import numpy as np
 import colorama as col
 
 import config
-import util
+import palette
+
+# the terminal holds the output between these back, and shows it at once
+SYNC_BEGIN = "\033[?2026h"
+SYNC_END = "\033[?2026l"
+
+
+def write_frame(text):
+    """
+    Writes a frame to the terminal as one synchronized update
+
+    On POSIX the frame goes out in a single os.write() on stdout's file
+    descriptor, past any wrapper around sys.stdout (e.g. colorama's, which
+    is only needed to translate escape codes on Windows).
+
+    Args:
+        text (str) : The encoded frame
+    """
+    text = SYNC_BEGIN + text + SYNC_END
+
+    try:
+        out = sys.stdout.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        out = None
+
+    if out is None or os.name != "posix":
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+
+    # anything printed earlier has to go out first
+    sys.stdout.flush()
+
+    data = memoryview(text.encode(sys.stdout.encoding or "utf-8"))
+    while data:
+        data = data[os.write(out, data):]
+
+
+class FrameEncoder:
+    """
+    Turns frames into the output which takes the terminal from the
+    previous frame to the next one
+
+    A frame is the grid of cells below the scoreboard, plus the lines of
+    the heads-up display above it. The encoder keeps its own copy of the
+    last frame, so the caller can draw the next frame into the same buffers.
+    """
+
+    def __init__(self, height, width):
+        """
+        Constructor for FrameEncoder
+
+        Args:
+            height, width (int) : Size of the frames
+        """
+        self.height, self.width = height, width
+
+        # what the terminal is currently showing, invalid forces a full repaint
+        self.__prev_display = np.full((height, width), " ")
+        self.__prev_color = np.zeros((height, width), dtype=np.uint8)
+        self.__prev_hud = []
+        self.__valid = False
+
+        # a new encoder starts from a blank terminal
+        self.__erase = True
+
+        # cursor move to every cell, with an extra row for below the frame
+        self.__moves = np.array([[f"\033[{config.SCREEN_TOP + i};{j + 1}H"
+                                  for j in range(width)]
+                                 for i in range(height + 1)], dtype=object)
+
+    def invalidate(self):
+        """
+        Forgets what is on the terminal, the next frame is fully repainted
+        """
+        self.__valid = False
+        self.__prev_hud = []
+
+    def changed_cells(self, display, color):
+        """
+        Finds the cells which differ from what is already on the terminal
+
+        Returns:
+            2D np.array : True wherever the cell has to be redrawn
+        """
+        if not self.__valid:
+            return np.ones((self.height, self.width), dtype=bool)
+
+        return (display != self.__prev_display) | (color != self.__prev_color)
+
+    def encode(self, display, color, escapes, hud=()):
+        """
+        Builds the output which takes the terminal from the previous frame
+        to this one. Only the changed spans are emitted, each one
+        preceded by a cursor move, and color codes are only emitted where
+        the color changes. The whole frame is assembled with NumPy and
+        joined once.
+
+        Args:
+            display (2D np.array) : Character of each cell
+            color (2D np.array)   : Palette index of each cell's color
+            escapes (np.array)    : Escape code of each palette index
+            hud (list)            : Lines of text from the top of the
+                                    terminal, only changed lines are written
+
+        Returns:
+            str : escape sequences + characters to be written
+        """
+        head = ""
+        if self.__erase:
+            head, self.__erase = "\033[2J", False
+
+        # the previous frame ended with a reset, so these are in plain colors
+        head += "".join(f"\033[{i + 1};1H{line}\033[K" for i, line in enumerate(hud)
+                        if i >= len(self.__prev_hud) or line != self.__prev_hud[i])
+        self.__prev_hud = list(hud)
+
+        changed = self.changed_cells(display, color)
+
+        # changed cells in row major order, i.e. the order they are written in
+        rows, cols = np.nonzero(changed)
+
+        # a span starts wherever the cell to the left is unchanged
+        starts = (cols == 0) | ~changed[rows, cols - 1]
+
+        colors = color[rows, cols]
+        needs_color = starts | (colors != color[rows, cols - 1])
+
+        cells = display[rows, cols].astype(object)
+        cells[needs_color] = escapes[colors[needs_color]] + cells[needs_color]
+        cells[starts] = self.__moves[rows[starts], cols[starts]] + cells[starts]
+
+        np.copyto(self.__prev_display, display)
+        np.copyto(self.__prev_color, color)
+        self.__valid = True
+
+        # park the cursor below the frame, where the old renderer left it
+        return head + "".join(cells.tolist()) + self.__moves[-1, 0] + col.Style.RESET_ALL
+
 
 class Screen:
     """
     This class manages the screen: whatever is printed, how the frames
     are updated, etc.
+
+    Frames are composited over a static layer, the sky and whatever was
+    baked into it (e.g. the ground), which is only drawn once. Every blit
+    notes the rectangle it covered, and clear() only restores those
+    rectangles from the static layer instead of redrawing the whole frame.
     """
 
     def __init__(self):
+        # where the frames are recorded, if anywhere
+        self.__cast = None
+
+        self.resize()
+
+    def resize(self):
+        """
+        Makes the frame fit config.WIDTH x config.HEIGHT, the terminal is
+        cleared and the next frame is fully repainted
+        """
         self.width, self.height = config.WIDTH, config.HEIGHT
-        self.clear()
+
+        if self.__cast is not None:
+            self.__cast.resize(config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+
+        # the static layer
+        self.__base_display = np.full((self.height, self.width), " ")
+        self.__base_color = np.full((self.height, self.width), palette.DEFAULT, dtype=np.uint8)
+
+        self.display = self.__base_display.copy()
+        self.color = self.__base_color.copy()
+
+        # regions drawn over since the last clear, None for all of them
+        self.__dirty = []
+
+        # a new encoder erases the terminal, whatever was outside the old
+        # frame would stay on it otherwise
+        self.__encoder = FrameEncoder(self.height, self.width)
+        self.hud = []
 
     def clear(self):
         """
-        This function clears the current frame
+        This function clears the current frame, back to the static layer
+        """
+        dirty, self.__dirty = self.__dirty, []
+
+        if dirty is None or len(dirty) > config.DIRTY_MAX:
+            np.copyto(self.display, self.__base_display)
+            np.copyto(self.color, self.__base_color)
+            return
+
+        for region in dirty:
+            self.display[region] = self.__base_display[region]
+            self.color[region] = self.__base_color[region]
+
+    def bake(self, obj):
+        """
+        Draws an object which doesn't move or change into the static layer
+
+        Args:
+            obj (GameObject) : The object, e.g. the ground
+        """
+        display, color = self.display, self.color
+        self.display, self.color = self.__base_display, self.__base_color
+
+        self.draw(obj)
+
+        self.display, self.color = display, color
+        self.__dirty = None
+
+    def swap_buffers(self, display, color, dirty):
         """
-        self.display = np.full((self.height, self.width), " ")
+        Switches to drawing into other buffers, for double buffering
 
-        self.color = util.tup_to_array((self.height, self.width), (config.BG_COL, config.FG_COL))
+        Args:
+            display, color (2D np.array) : The buffers to draw into now
+            dirty (list)                 : Their regions which differ from
+                                           the static layer, None if unknown
+
+        Returns:
+            list : Regions of the old buffers which differ from the static layer
+        """
+        dirty, self.__dirty = self.__dirty, dirty
+        self.display, self.color = display, color
+
+        return dirty
 
     def draw(self, obj, frame=0):
         """
         This function places an object on the frame
         """
         _x, _y = obj.get_position()
-        _h, _w = obj.get_shape()
+        disp, color = obj.get_rep(frame)
+
+        self.blit(disp, color, _x, _y)
+
+    def blit(self, disp, color, _x, _y):
+        """
+        This function places a sprite on the frame at (_x, _y)
+        """
+        _h, _w = disp.shape
 
         _x = int(_x)
         _y = int(_y)
-        _h = int(_h)
-        _w = int(_w)
 
-        disp, color = obj.get_rep(frame)
+        # the part of the sprite which is on screen
+        top, left = max(0, _y), max(0, _x)
+        bottom, right = min(_y + _h, self.height), min(_x + _w, config.WIDTH)
 
-        disp = disp[:, max(0, -_x):min(config.WIDTH - _x, _w)]
-        color = color[:, max(0, -_x):min(config.WIDTH - _x, _w)]
+        if bottom <= top or right <= left:
+            return
 
-        self.display[_y:_y+_h, max(0, _x):min(_x+_w, config.WIDTH)] = disp
-        self.color[_y:_y+_h, max(0, _x):min(_x+_w, config.WIDTH)] = color
+        self.display[top:bottom, left:right] = disp[top - _y:bottom - _y, left - _x:right - _x]
+        self.color[top:bottom, left:right] = color[top - _y:bottom - _y, left - _x:right - _x]
+
+        if self.__dirty is not None:
+            self.__dirty.append((slice(top, bottom), slice(left, right)))
+
+    def draw_points(self, xs, ys, char, color):
+        """
+        This function places many single character sprites on the frame
+
+        Args:
+            xs (1D np.array) : x of each point
+            ys (1D np.array) : y of each point
+            char (str)       : The character to place
+            color (int)      : Palette index of its color
+        """
+        on_screen = (xs >= 0) & (xs < config.WIDTH) & (ys >= 0) & (ys < self.height)
+        points = (ys[on_screen], xs[on_screen])
+
+        self.display[points] = char
+        self.color[points] = color
+
+        if self.__dirty is not None:
+            self.__dirty.append(points)
+
+    def invalidate(self):
+        """
+        Forgets what is on the terminal, the next frame is fully repainted
+        """
+        self.__encoder.invalidate()
+
+    def changed_cells(self):
+        """
+        Finds the cells which differ from what is already on the terminal
+
+        Returns:
+            2D np.array : True wherever the cell has to be redrawn
+        """
+        return self.__encoder.changed_cells(self.display, self.color)
+
+    def render(self):
+        """
+        Builds the output which takes the terminal from the previous frame
+        to the current one, see FrameEncoder.encode
+
+        Returns:
+            str : escape sequences + characters to be written
+        """
+        return self.__encoder.encode(self.display, self.color, palette.ESCAPES, self.hud)
+
+    def set_hud(self, lines):
+        """
+        Sets the lines of text shown above the frame, e.g. the scoreboard
+
+        Args:
+            lines (list) : One string per terminal row, from the top
+        """
+        self.hud = lines
+
+    def set_cast(self, cast):
+        """
+        Records every frame shown from now on
+
+        Args:
+            cast (CastWriter) : Where the frames are recorded
+        """
+        self.__cast = cast
 
     def show(self):
         """
         This function displays the current frame on the screen
         """
-        out = ""
+        text = self.render()
+        write_frame(text)
+
+        if self.__cast is not None:
+            self.__cast.write(text)
+
+    def close(self):
+        """
+        Done with the screen, nothing more is shown after this
+        """
 
-        for i in range(self.height):
-            for j in range(self.width):
-                out += "".join(self.color[i][j]) + self.display[i][j]
-            out += "\n"
 
-        sys.stdout.write(out + col.Style.RESET_ALL)
+class NullScreen(Screen):
+    """
+    A screen which throws everything away, for running without a terminal
+    """
+
+    def __init__(self):
+        self.resize()
+
+    def resize(self):
+        self.width, self.height = config.WIDTH, config.HEIGHT
+
+    def clear(self):
+        pass
+
+    def bake(self, obj):
+        pass
+
+    def blit(self, disp, color, _x, _y):
+        pass
+
+    def draw_points(self, xs, ys, char, color):
+        pass
+
+    def render(self):
+        return ""
+
+    def show(self):
+        pass
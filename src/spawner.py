@@ -0,0 +1,201 @@
+"""
+This file contains the spawn scheduler
+
+The random numbers of a game are drawn ahead of time on a background
+thread, a batch of config.SPAWN_BATCH ticks at a time, and kept in a queue
+of at most config.SPAWN_LOOKAHEAD batches. The game only pops the spawns
+due on the current tick, and the homing of the boss and its bullets takes
+its normals from a buffer which is refilled the same way.
+
+Each stream has its own generator, seeded from the game's seed, and only
+the background thread draws from them. So the same seed gives the same
+game no matter how the thread is scheduled.
+
+Positions are kept as fractions and the chances of spawning as the raw
+uniform numbers, both are only turned into spawns when popped, under the
+screen size and config in effect at that tick.
+"""
+
+import queue
+import threading
+import numpy as np
+
+import config
+import util
+
+# normals drawn at once for the boss and its bullets
+NORMAL_BATCH = 4096
+
+
+class SpawnScheduler:
+    """
+    A seeded stream of future spawns and normals, drawn on another thread
+    """
+
+    def __init__(self, seed):
+        """
+        Constructor for SpawnScheduler
+
+        Args:
+            seed (int) : Seed for all the numbers drawn
+        """
+        spawn_seed, normal_seed = np.random.SeedSequence(seed).spawn(2)
+
+        self.__spawns = queue.Queue(maxsize=config.SPAWN_LOOKAHEAD)
+        self.__normals = queue.Queue(maxsize=config.SPAWN_LOOKAHEAD)
+
+        # set whenever a batch is taken, or to stop the thread
+        self.__wanted = threading.Event()
+        self.__stopped = False
+
+        # what the thread died of, raised by the game's next take
+        self.__error = None
+
+        # the batch of spawns being popped from, and the normals left over
+        self.__batch = None
+        self.__end = 1
+        self.__normal_buf = np.empty(0)
+        self.__normal_pos = 0
+
+        self.__thread = threading.Thread(target=self.__run, daemon=True, args=(
+            np.random.default_rng(spawn_seed), np.random.default_rng(normal_seed)))
+        self.__thread.start()
+
+    def __run(self, spawn_rng, normal_rng):
+        """
+        Keeps both queues full until close()d
+        """
+        # the game's first tick is 1
+        start = 1
+
+        try:
+            while not self.__stopped:
+                while not self.__spawns.full():
+                    self.__spawns.put(self.draw_spawns(spawn_rng, start, config.SPAWN_BATCH))
+                    start += config.SPAWN_BATCH
+
+                while not self.__normals.full():
+                    self.__normals.put(normal_rng.standard_normal(NORMAL_BATCH))
+
+                self.__wanted.wait()
+                self.__wanted.clear()
+        except Exception as err:
+            # the game would wait for the next batch forever, so it gets
+            # the error instead. A queue which is full isn't waited on, its
+            # next take sees self.__error
+            self.__error = err
+
+            for batches in (self.__spawns, self.__normals):
+                try:
+                    batches.put_nowait(err)
+                except queue.Full:
+                    pass
+
+    @staticmethod
+    def draw_spawns(rng, start, ticks):
+        """
+        Draws the spawns of a range of ticks
+
+        Args:
+            rng (Generator) : Generator to draw from
+            start (int)     : First tick of the range
+            ticks (int)     : Number of ticks in the range
+
+        Returns:
+            dict : Arrays with a row for every tick
+        """
+        return {
+            "start": start,
+            # compared to the firebeam, magnet and coins chances
+            "chance": rng.random((ticks, 3)),
+            "beam_y": rng.random(ticks),
+            "beam_orientation": rng.integers(0, config.FIREBEAM_MAX, ticks),
+            "magnet_bottom": rng.random(ticks) > 0.5,
+            "coins_y": rng.random(ticks),
+            "coins_width": rng.integers(3, 11, ticks)
+        }
+
+    def __take(self, batches):
+        """
+        Returns the next batch from a queue, making room for another one,
+        or raises whatever the background thread died of
+        """
+        if self.__error is not None:
+            raise self.__error
+
+        batch = batches.get()
+        if isinstance(batch, Exception):
+            raise batch
+
+        self.__wanted.set()
+
+        return batch
+
+    def pop(self, tick):
+        """
+        Returns the spawns due on a tick, ticks skipped are dropped
+
+        Args:
+            tick (int) : The tick, later than any popped before
+
+        Returns:
+            list : ("firebeam", y, orientation), ("magnet", y) and
+                   ("coins", y, width) tuples
+        """
+        while tick >= self.__end:
+            self.__batch = self.__take(self.__spawns)
+            self.__end = self.__batch["start"] + len(self.__batch["chance"])
+
+        row = tick - self.__batch["start"]
+        if row < 0:
+            return []
+
+        batch = self.__batch
+        beam, magnet, coins = batch["chance"][row] > 1 - np.array(
+            [config.FIREBEAM_PROB, config.MAGNET_PROB, config.COINS_PROB])
+
+        events = []
+        if beam:
+            events.append(("firebeam", util.scale(batch["beam_y"][row], 0, config.MAX_HEIGHT - 6),
+                           int(batch["beam_orientation"][row])))
+        if magnet:
+            events.append(("magnet", config.MAX_HEIGHT - 3 if batch["magnet_bottom"][row] else 0))
+        if coins:
+            events.append(("coins", util.scale(batch["coins_y"][row], 0, config.MAX_HEIGHT - 4),
+                           int(batch["coins_width"][row])))
+
+        return events
+
+    def normal(self, size=None):
+        """
+        Returns normals from the buffer, like Generator.normal()
+
+        Args:
+            size (int) : Number of normals, a single float if not given
+        """
+        if size is None:
+            return float(self.normal(1)[0])
+
+        out = np.empty(size)
+        filled = 0
+
+        while filled < size:
+            if self.__normal_pos == len(self.__normal_buf):
+                self.__normal_buf = self.__take(self.__normals)
+                self.__normal_pos = 0
+
+            count = min(size - filled, len(self.__normal_buf) - self.__normal_pos)
+            out[filled:filled + count] = \
+                self.__normal_buf[self.__normal_pos:self.__normal_pos + count]
+
+            filled += count
+            self.__normal_pos += count
+
+        return out
+
+    def close(self):
+        """
+        Stops the background thread
+        """
+        self.__stopped = True
+        self.__wanted.set()
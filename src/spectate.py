@@ -0,0 +1,227 @@
+"""
+This file contains the spectator server, and the client to watch with
+
+The game publish()es every frame it shows. The server runs an asyncio
+event loop on a thread of its own, and sends each spectator the output
+which takes its terminal from the last frame it got to the latest one,
+through a zlib stream of its own. A spectator which can't keep up just
+gets fewer frames: only the latest frame is kept, and it is sent once the
+previous one is out of the way.
+
+publish() only copies the frame and wakes the event loop, so the game is
+never held up by its spectators.
+
+Run this file to watch a game started with --spectate:
+
+    python3 spectate.py --port 7777
+"""
+
+import sys
+import zlib
+import socket
+import asyncio
+import argparse
+import threading
+import colorama as col
+
+from screen import FrameEncoder
+import palette
+import config
+
+
+class SpectatorServer:
+    """
+    Streams the frames of a game to everyone connected over TCP
+    """
+
+    def __init__(self, port, host=None):
+        """
+        Constructor for SpectatorServer, listens right away
+
+        Args:
+            port (int) : Port to listen on, 0 picks a free one
+            host (str) : Address to listen on, config.SPECTATE_HOST by default
+        """
+        self.__clients = set()
+
+        # (version, display, color, hud, escapes) of the latest frame
+        self.__latest = (0, None, None, None, None)
+        self.__loop = None
+        self.__error = None
+
+        started = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                         args=(host or config.SPECTATE_HOST, port, started))
+        self.__thread.start()
+
+        started.wait()
+        if self.__error is not None:
+            raise self.__error
+
+    def __run(self, host, port, started):
+        """
+        The server's thread
+        """
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        try:
+            server = loop.run_until_complete(asyncio.start_server(self.__serve, host, port))
+        except OSError as err:
+            self.__error = err
+            loop.close()
+            started.set()
+            return
+
+        # woken up, and replaced, whenever there is a new frame
+        self.__new = asyncio.Event()
+
+        self.__port = server.sockets[0].getsockname()[1]
+        self.__loop = loop
+        started.set()
+
+        try:
+            loop.run_forever()
+        finally:
+            server.close()
+
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+            loop.close()
+
+    def __announce(self):
+        """
+        Wakes up every spectator waiting for a frame
+        """
+        new, self.__new = self.__new, asyncio.Event()
+        new.set()
+
+    async def __serve(self, _reader, writer):
+        """
+        Sends frames to one spectator until it leaves
+        """
+        if len(self.__clients) >= config.SPECTATORS_MAX:
+            writer.close()
+            return
+
+        self.__clients.add(writer)
+        writer.transport.set_write_buffer_limits(high=config.SPECTATE_BUFFER)
+
+        stream = zlib.compressobj()
+        encoder = None
+        version = 0
+
+        try:
+            while True:
+                while self.__latest[0] == version:
+                    await self.__new.wait()
+
+                version, display, color, hud, escapes = self.__latest
+
+                head = ""
+                if encoder is None or (encoder.height, encoder.width) != display.shape:
+                    # a new encoder starts with clearing the screen
+                    encoder = FrameEncoder(*display.shape)
+                    head = "\033[?25l"
+
+                text = head + encoder.encode(display, color, escapes, hud)
+
+                writer.write(stream.compress(text.encode()) + stream.flush(zlib.Z_SYNC_FLUSH))
+
+                # frames published meanwhile are skipped, all but the latest
+                await writer.drain()
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            # gone, or the server is closing
+            pass
+        finally:
+            self.__clients.discard(writer)
+            writer.close()
+
+    def publish(self, display, color, hud):
+        """
+        Hands a frame over to the spectators, if there are any
+
+        Args:
+            display (2D np.array) : Character of each cell
+            color (2D np.array)   : Palette index of each cell's color
+            hud (list)            : Lines of text above the frame
+        """
+        if not self.__clients or self.__loop is None:
+            return
+
+        self.__latest = (self.__latest[0] + 1, display.copy(), color.copy(),
+                         list(hud), palette.ESCAPES)
+
+        try:
+            self.__loop.call_soon_threadsafe(self.__announce)
+        except RuntimeError:
+            # the loop is closed
+            pass
+
+    def get_port(self):
+        """
+        Returns the port the server listens on
+        """
+        return self.__port
+
+    def get_clients(self):
+        """
+        Returns the number of spectators
+        """
+        return len(self.__clients)
+
+    def close(self):
+        """
+        Disconnects every spectator and stops the server
+        """
+        if self.__loop is None:
+            return
+
+        try:
+            self.__loop.call_soon_threadsafe(self.__loop.stop)
+        except RuntimeError:
+            pass
+
+        self.__thread.join(2)
+        self.__loop = None
+
+
+def watch(port, host=None):
+    """
+    Shows the game streamed by a spectator server, until it ends or ^C
+
+    Args:
+        port (int) : Port of the server
+        host (str) : Address of the server, config.SPECTATE_HOST by default
+    """
+    stream = zlib.decompressobj()
+
+    with socket.create_connection((host or config.SPECTATE_HOST, port)) as sock:
+        try:
+            while True:
+                data = sock.recv(1 << 16)
+                if not data:
+                    break
+
+                # the frames are written as they are, a character split
+                # between two reads is put together by the terminal
+                sys.stdout.buffer.write(stream.decompress(data))
+                sys.stdout.flush()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print(col.Style.RESET_ALL + "\033[?25h")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch a game started with --spectate")
+    parser.add_argument("--host", default=config.SPECTATE_HOST, help="address of the game")
+    parser.add_argument("--port", type=int, default=config.SPECTATE_PORT,
+                        help="port the game streams on")
+    args = parser.parse_args()
+
+    col.init()
+    watch(args.port, args.host)
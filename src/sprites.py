@@ -0,0 +1,125 @@
+"""
+This file contains the sprite registry
+
+Each sprite is compiled from graphics.py the first time it is asked for.
+The (rep, color) arrays are read-only and shared by every object which
+uses the sprite, so creating an object doesn't parse anything.
+"""
+
+import numpy as np
+import colorama as col
+
+import graphics
+import util
+
+# name -> (art, (bg, fg), should spaces get the background color?)
+SPRITES = {
+    "mandalorian_bullet": (graphics.MANDALORIAN_BULLET, (col.Back.WHITE, col.Fore.BLACK), False),
+    "boss_bullet": (graphics.BOSS_BULLET, (col.Back.RED, col.Fore.YELLOW), False),
+    "magnet": (graphics.MAGNET, (col.Back.MAGENTA, col.Fore.RED), False),
+    "coin": (graphics.COIN, (col.Back.YELLOW, col.Fore.RED), False),
+    "dragon_head": (graphics.DRAGON_HEAD, (col.Back.BLACK, col.Fore.GREEN), False),
+}
+
+for _k, _art in enumerate(graphics.FIREBEAM):
+    SPRITES[f"firebeam_{_k}"] = (_art, (col.Back.RED, col.Fore.YELLOW), True)
+
+_CACHE = {}
+
+
+def get(name):
+    """
+    Returns the compiled sprite
+
+    Args:
+        name (str) : Name of the sprite in SPRITES
+
+    Returns:
+        (2D np.array, 2D np.array) : read-only (rep, color)
+    """
+    if name not in _CACHE:
+        art, color, masked = SPRITES[name]
+
+        rep = util.str_to_array(art)
+        grid_col = util.tup_to_array(rep.shape, color)
+
+        if masked:
+            grid_col = util.mask(rep, grid_col)
+
+        rep.setflags(write=False)
+        grid_col.setflags(write=False)
+
+        _CACHE[name] = (rep, grid_col)
+
+    return _CACHE[name]
+
+
+def firebeam(orientation):
+    """
+    Returns the sprite of the FireBeam with the given orientation
+    """
+    return get(f"firebeam_{orientation}")
+
+
+def sine_wave(height, width, phase, char="~"):
+    """
+    Draws a 3 character thick sine wave spanning one period
+
+    Args:
+        height (int) : Height of the grid
+        width (int)  : Width of the grid (one period)
+        phase (float): Phase offset of the wave
+        char (str)   : Character the wave is made of
+
+    Returns:
+        (2D np.array, 1D np.array) : The grid and the row of each column
+    """
+    rep = np.full((height, width), " ")
+
+    _y = np.sin(np.linspace(-np.pi, np.pi, width) + phase)
+    _y *= (height / 2)
+    _y += (height / 2)
+
+    # sin() can hit 1 exactly, which would be one row too far down
+    _y = np.minimum(_y.astype(int), height - 1)
+    cols = np.arange(width)
+
+    rep[_y, cols] = char
+    rep[np.where(_y > height - 2, _y - 2, _y + 1), cols] = char
+    rep[np.where(_y == 0, 2, _y - 1), cols] = char
+
+    return rep, _y
+
+
+class FrameCache:
+    """
+    Holds the frames of a periodic animation, indexed by phase
+
+    The period is split into a fixed number of steps and each frame is
+    built the first time its step is asked for.
+    """
+
+    def __init__(self, build, steps, period=2 * np.pi):
+        """
+        Constructor for FrameCache
+
+        Args:
+            build (callable) : Builds the frame for a phase, build(phase)
+            steps (int)      : Number of frames in one period
+            period (float)   : Length of the period
+        """
+        self.__build = build
+        self.__steps = steps
+        self.__period = period
+        self.__frames = [None] * steps
+
+    def get(self, phase):
+        """
+        Returns the cached frame nearest to the phase
+        """
+        step = int(round((phase % self.__period) * self.__steps / self.__period)) % self.__steps
+
+        if self.__frames[step] is None:
+            self.__frames[step] = self.__build(step * self.__period / self.__steps)
+
+        return self.__frames[step]
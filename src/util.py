@@ -2,34 +2,53 @@
 This file contains some frequently used functions
 """
 
+import os
 import sys
+import json
+import time
+import codecs
 import termios
 import atexit
 from select import select
+from collections import deque
 import random
 import numpy as np
 
-import config
+import palette
 
-def clear():
+def randint(beg, end, rng=None):
     """
-    This positions the cursor at (0, 0)
+    This function returns a random integer between beg and end [inclusive]
+
+    Args:
+        beg (int)                 : lower limit of the random number
+        end (int)                 : upper limit of the random number
+        rng (np.random.Generator) : Generator to draw from, the random
+                                    module is used if not given
+
+    Returns:
+        int       : A random number in the range [beg, end]
     """
-    print("\033[0;0H")
+    if rng is None:
+        return random.randint(beg, end)
 
+    return int(rng.integers(beg, end + 1))
 
-def randint(beg, end):
+
+def scale(frac, beg, end):
     """
-    This function returns a random integer between beg and end [inclusive]
+    This function maps a fraction in [0, 1) to an integer between beg and
+    end [inclusive], each of them equally likely for a uniform fraction
 
     Args:
-        beg (int) : lower limit of the random number
-        end (int) : upper limit of the random number
+        frac (float) : The fraction
+        beg (int)    : lower limit of the number
+        end (int)    : upper limit of the number
 
     Returns:
-        int       : A random number in the range [beg, end]
+        int       : A number in the range [beg, end]
     """
-    return random.randint(beg, end)
+    return beg + min(int(frac * (end - beg + 1)), end - beg)
 
 
 def str_to_array(rep):
@@ -51,20 +70,17 @@ def str_to_array(rep):
 
 def tup_to_array(shape, tup):
     """
-    This function returns a 2D np.array, with the given shape, all elements
-    initialized with the tuple tup
+    This function returns a 2D color array, with the given shape, all elements
+    set to the palette index of the tuple tup
 
     Args:
         shape (nrows, ncols) : Shape of the 2D np.array
-        tup (tuple)          : Tuple which is used to initialize the array
+        tup (bg, fg)         : Color which is used to initialize the array
 
     Returns:
-        2D np.array          : Array with all elements = tup
+        2D np.array          : np.uint8 array with all elements = index of tup
     """
-    val = np.empty((), dtype=object)
-    val[()] = tup
-
-    return np.full(shape, val, dtype=object)
+    return np.full(shape, palette.register(tup), dtype=np.uint8)
 
 
 def mask(rep, color):
@@ -78,20 +94,40 @@ def mask(rep, color):
     Returns:
         2D np.array : space color set to bg
     """
-    max_i, max_j = rep.shape
-
-    for i in range(max_i):
-        for j in range(max_j):
-            if rep[i][j] == " ":
-                color[i][j] = (config.BG_COL, config.FG_COL)
+    color[rep == " "] = palette.DEFAULT
 
     return color
 
 
+def overlaps(boxes_a, boxes_b):
+    """
+    Checks which boxes overlap, boxes are [x, y, h, w] along the last axis
+    and broadcast against each other like any np.array
+
+    Args:
+        boxes_a (np.array) : A box, or rows of boxes
+        boxes_b (np.array) : A box, or rows of boxes
+
+    Returns:
+        np.array : True wherever the boxes overlap
+    """
+    x_a, y_a, h_a, w_a = np.moveaxis(np.asarray(boxes_a), -1, 0)
+    x_b, y_b, h_b, w_b = np.moveaxis(np.asarray(boxes_b), -1, 0)
+
+    span_x = np.maximum(x_a + w_a, x_b + w_b) - np.minimum(x_a, x_b)
+    span_y = np.maximum(y_a + h_a, y_b + h_b) - np.minimum(y_a, y_b)
+
+    return (span_x < w_a + w_b) & (span_y < h_a + h_b)
+
+
 class KBHit:
     """
     Class to handle keyboard input
     A modified version of "https://stackoverflow.com/a/22085679"
+
+    Every byte waiting on stdin is read into a queue as soon as it is
+    seen, so keys pressed in a burst are all kept, in order, until the
+    game asks for them with keys().
     """
 
     def __init__(self):
@@ -110,6 +146,11 @@ class KBHit:
         # Support normal-terminal reset at exit
         atexit.register(self.set_normal_term)
 
+        # a key can be split over two reads, e.g. multi byte characters
+        self.__decoder = codecs.getincrementaldecoder(sys.stdin.encoding or "utf-8")("replace")
+        self.__queue = deque()
+        self.__eof = False
+
 
     def set_normal_term(self):
         """
@@ -118,25 +159,121 @@ class KBHit:
         termios.tcsetattr(self.__fd, termios.TCSAFLUSH, self.__old_term)
 
 
-    @staticmethod
-    def getch():
+    def __drain(self, timeout=0.):
         """
-        Returns a keyboard character after kbhit() has been called.
-        Should not be called in the same program as getarrow().
+        Waits up to timeout seconds for input, then queues all of it
+
+        Returns:
+            bool : Was there any input?
         """
-        return sys.stdin.read(1)
+        if self.__eof or not select([self.__fd], [], [], max(0., timeout))[0]:
+            return False
 
+        data = os.read(self.__fd, 4096)
+        if not data:
+            # stdin was closed, there will never be anything to select
+            self.__eof = True
 
-    @staticmethod
-    def kbhit():
+        self.__queue.extend(self.__decoder.decode(data))
+
+        return True
+
+    def wait_until(self, deadline):
+        """
+        Blocks till time.perf_counter() reaches deadline, queueing keys as
+        they come in
+        """
+        while True:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                return
+
+            if self.__eof:
+                time.sleep(timeout)
+            else:
+                self.__drain(timeout)
+
+    def keys(self):
         """
-        Returns True if keyboard character was hit, False otherwise.
+        Returns every key pressed since the last call, in order
         """
-        return select([sys.stdin], [], [], 0)[0] != []
+        while self.__drain():
+            pass
+
+        keys = list(self.__queue)
+        self.__queue.clear()
+
+        return keys
+
+
+class ScriptedInput:
+    """
+    Stands in for KBHit, replaying keys from a script instead of stdin
+    """
+
+    def __init__(self, script, clock):
+        """
+        Constructor for ScriptedInput
+
+        Args:
+            script (dict)    : tick -> keys pressed during that tick
+            clock (callable) : Returns the current tick
+        """
+        self.__script = script
+        self.__clock = clock
+        self.__pending = []
+        self.__seen = 0
+
+    def __poll(self):
+        """
+        Moves the keys which are due into the input buffer
+        """
+        tick = self.__clock()
+
+        while self.__seen < tick:
+            self.__seen += 1
+            self.__pending.extend(self.__script.get(self.__seen, ""))
+
+    def keys(self):
+        """
+        Returns all the keys which are due, in order
+        """
+        self.__poll()
+
+        keys, self.__pending = self.__pending, []
+
+        return keys
 
     @staticmethod
-    def clear():
+    def wait_until(deadline):
         """
-        Clears the input buffer
+        Sleeps till time.perf_counter() reaches deadline
         """
-        termios.tcflush(sys.stdin, termios.TCIFLUSH)
+        time.sleep(max(0., deadline - time.perf_counter()))
+
+
+def load_script(path):
+    """
+    Reads an input script, each line is a tick followed by the keys
+    pressed in it as a JSON string, e.g. `10 "ww"`
+
+    Args:
+        path (str) : Path of the script
+
+    Returns:
+        dict : tick -> keys
+    """
+    script = {}
+
+    with open(path) as _f:
+        for line in _f:
+            line = line.strip()
+
+            # comments, and the header of recordings
+            if not line or line.startswith("#") or line.startswith("{"):
+                continue
+
+            tick, keys = line.split(" ", 1)
+            script[int(tick)] = script.get(int(tick), "") + json.loads(keys)
+
+    return script